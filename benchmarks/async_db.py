@@ -0,0 +1,125 @@
+"""
+Requests/sec of the sync vs async (DB_MODE=async) database paths.
+
+Each mode runs in its own subprocess, because DB_MODE is read at import
+time. The app is driven in-process through httpx's ASGI transport by
+``--clients`` concurrent clients issuing a mix of single-row and list reads.
+
+Usage:
+    pip install httpx aiosqlite
+    python benchmarks/async_db.py --app ecommerce --clients 200 --requests 5000
+    python benchmarks/async_db.py --app students --clients 200 --requests 5000
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import Dict, List
+
+import httpx
+from sqlalchemy import insert
+
+from common import load_app_package, submodule, summarize
+
+# (path for a single row, path for a page, model name, seed row factory)
+TARGETS = {
+    "students": ("/students/{id}", "/students/", "Student",
+                 lambda i: {"name": f"Student {i}", "age": 18 + i % 10, "email": f"student{i}@example.com",
+                            "grades": [60.0 + i % 40, 70.0]}),
+    "ecommerce": ("/products/{id}", "/products/", "Product",
+                  lambda i: {"name": f"Product {i}", "price": 1.0 + i % 100, "stock": 100}),
+}
+
+
+def seed(package, app_name: str, rows: int) -> None:
+    """Insert benchmark rows directly with the sync engine."""
+    _, _, model_name, factory = TARGETS[app_name]
+    model = getattr(submodule(package, "models"), model_name)
+    with submodule(package, "utils").SessionLocal() as db:
+        db.execute(insert(model), [factory(i) for i in range(rows)])
+        db.commit()
+
+
+async def drive(app, app_name: str, rows: int, clients: int, total: int) -> Dict:
+    item_path, list_path, _, _ = TARGETS[app_name]
+    latencies: List[float] = []
+    errors = 0
+    remaining = iter(range(total))
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def worker():
+            nonlocal errors
+            for n in remaining:
+                if n % 4 == 0:
+                    url = f"{list_path}?limit=20&skip={random.randrange(rows)}"
+                else:
+                    url = item_path.format(id=random.randint(1, rows))
+                start = time.perf_counter()
+                response = await client.get(url)
+                latencies.append(time.perf_counter() - start)
+                errors += response.status_code != 200
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(clients)))
+        elapsed = time.perf_counter() - start
+
+    return {
+        "requests": total,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_s": round(total / elapsed, 1),
+        "latency": summarize(latencies),
+    }
+
+
+def run_worker(args: argparse.Namespace) -> Dict:
+    package = load_app_package(args.app)
+    seed(package, args.app, args.rows)
+    app = submodule(package, "main").app
+    result = asyncio.run(drive(app, args.app, args.rows, args.clients, args.requests))
+    result["mode"] = os.environ.get("DB_MODE", "sync")
+    return result
+
+
+def main(args: argparse.Namespace) -> Dict:
+    results = {}
+    for mode in ("sync", "async"):
+        command = [sys.executable, os.path.abspath(__file__), "--worker",
+                   "--app", args.app, "--rows", str(args.rows),
+                   "--clients", str(args.clients), "--requests", str(args.requests)]
+        try:
+            output = subprocess.run(command, env={**os.environ, "DB_MODE": mode}, timeout=args.mode_timeout,
+                                    check=True, capture_output=True, text=True).stdout
+            results[mode] = json.loads(output)
+        except subprocess.TimeoutExpired:
+            # Blocking DB calls on the event loop can starve the connection
+            # pool at high concurrency; report the stall instead of hanging.
+            results[mode] = {"mode": mode, "stalled": True, "timeout_s": args.mode_timeout}
+    report = {
+        "benchmark": "async_db",
+        "app": args.app,
+        "clients": args.clients,
+        "sync": results["sync"],
+        "async": results["async"],
+    }
+    if "requests_per_s" in results["sync"] and "requests_per_s" in results["async"]:
+        report["speedup"] = round(results["async"]["requests_per_s"] / results["sync"]["requests_per_s"], 2)
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--app", choices=sorted(TARGETS), default="ecommerce")
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--clients", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--mode-timeout", type=float, default=300.0, help="seconds before a mode counts as stalled")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+    result = run_worker(arguments) if arguments.worker else main(arguments)
+    print(json.dumps(result, indent=2))
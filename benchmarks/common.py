@@ -0,0 +1,56 @@
+"""Shared helpers for the benchmark scripts in this directory."""
+import importlib
+import os
+import sys
+import tempfile
+from types import ModuleType
+from typing import Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APPS = {
+    "students": ("task 1", "Student_Management_System"),
+    "ecommerce": ("task 2", "E-commerce"),
+}
+
+
+def load_app_package(name: str) -> ModuleType:
+    """
+    Import one of the FastAPI projects with a fresh SQLite database.
+
+    Both projects use a database path relative to the working directory, so
+    this switches to a new temporary directory first and creates the tables.
+
+    Returns:
+        The imported package; submodules are reachable through import_module.
+    """
+    project_dir, package = APPS[name]
+    os.chdir(tempfile.mkdtemp(prefix=f"bench-{name}-"))
+    sys.path.insert(0, os.path.join(REPO_ROOT, project_dir))
+    module = importlib.import_module(package)
+    importlib.import_module(f"{package}.main")
+    importlib.import_module(f"{package}.utils").create_db_and_tables()
+    return module
+
+
+def submodule(package: ModuleType, name: str) -> ModuleType:
+    return importlib.import_module(f"{package.__name__}.{name}")
+
+
+def percentile(samples: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a list of samples."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds."""
+    return {
+        "count": len(samples),
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "max_ms": round(max(samples, default=0.0) * 1000, 3),
+    }
@@ -0,0 +1,283 @@
+"""
+Mixed-workload load test for both apps, reported as JSON per route.
+
+Each app runs in its own subprocess against a fresh SQLite database seeded
+at ``--scale`` and is driven in-process through httpx's ASGI transport (no
+sockets). ``--concurrency`` virtual users each pick operations at random
+according to ``--mix``, so every run exercises the same blend of reads and
+writes. Save the JSON of two commits and compare p50/p95/p99 per route to
+spot regressions.
+
+Operations:
+    students:  login, list, get, search, create
+    ecommerce: login, list, get, search, create, add_to_cart, checkout
+
+Usage:
+    pip install httpx
+    python benchmarks/load_test.py --app all --scale small --concurrency 50 --requests 5000
+    python benchmarks/load_test.py --app ecommerce --mix "get=60,add_to_cart=30,checkout=10" --output run.json
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import insert, select
+
+from common import APPS, REPO_ROOT, load_app_package, submodule, summarize
+
+SCALES = {"small": 1_000, "medium": 10_000, "large": 100_000}
+SEED_BATCH_SIZE = 5_000
+BENCH_PASSWORD = "bench-password"
+DEFAULT_MIX = {
+    "students": "list=30,get=40,search=10,create=15,login=5",
+    "ecommerce": "list=25,get=30,search=10,create=5,add_to_cart=20,checkout=8,login=2",
+}
+
+# An operation issues one or more requests and returns (route label, status, seconds) for each.
+Sample = Tuple[str, int, float]
+
+
+def parse_mix(mix: str, operations: Dict[str, Callable]) -> Tuple[List[str], List[int]]:
+    names, weights = [], []
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in operations:
+            raise SystemExit(f"unknown operation {name!r}; choose from {', '.join(sorted(operations))}")
+        names.append(name)
+        weights.append(int(weight or 1))
+    return names, weights
+
+
+async def timed(client: httpx.AsyncClient, label: str, method: str, url: str, **kwargs) -> Sample:
+    start = time.perf_counter()
+    response = await client.request(method, url, **kwargs)
+    return label, response.status_code, time.perf_counter() - start
+
+
+def seed_students(package, rows: int) -> Dict:
+    crud = submodule(package, "crud.student")
+    with submodule(package, "utils").SessionLocal() as db:
+        for offset in range(0, rows, SEED_BATCH_SIZE):
+            crud.create_students_bulk([
+                {"name": f"Student {i}", "age": 18 + i % 10, "email": f"student{i}@example.com",
+                 "grades": [50.0 + i % 50, 60.0 + i % 40, 70.0]}
+                for i in range(offset, min(rows, offset + SEED_BATCH_SIZE))
+            ], db)
+    token = submodule(package, "auth").create_access_token(data={"sub": "admin"})
+    return {"rows": rows, "headers": [{"Authorization": f"Bearer {token}"}]}
+
+
+def seed_ecommerce(package, rows: int, users: int) -> Dict:
+    auth = submodule(package, "auth")
+    models = submodule(package, "models")
+    crud = submodule(package, "crud.product")
+    hashed = auth.hash_password(BENCH_PASSWORD)
+    with submodule(package, "utils").SessionLocal() as db:
+        db.execute(insert(models.User), [
+            {"name": f"User {i}", "age": 30, "email": f"user{i}@example.com", "username": f"user{i}",
+             "hashed_password": hashed, "is_active": True, "is_admin": i == 0}
+            for i in range(users)
+        ])
+        for offset in range(0, rows, SEED_BATCH_SIZE):
+            db.execute(insert(models.Product), [
+                {"name": f"Product {i}", "price": 1.0 + i % 100, "stock": 1_000_000}
+                for i in range(offset, min(rows, offset + SEED_BATCH_SIZE))
+            ])
+        crud.sync_product_search(db, *db.execute(select(models.Product.id)).scalars())
+        db.commit()
+    # Checkouts must not append to the repository's order journal.
+    submodule(package, "order_journal").order_journal.directory = os.path.join(os.getcwd(), "orders")
+    headers = [
+        {"Authorization": f"Bearer {auth.create_access_token(data={'sub': f'user{i}'})}"}
+        for i in range(users)
+    ]
+    return {"rows": rows, "headers": headers}
+
+
+def student_operations(state: Dict) -> Dict[str, Callable]:
+    rows = state["rows"]
+    admin = state["headers"][0]
+    counter = itertools.count()
+
+    async def login(client, user):
+        return [await timed(client, "login", "POST", "/token", data={"username": "admin", "password": "admin123"})]
+
+    async def list_page(client, user):
+        return [await timed(client, "list", "GET", "/students/", params={"limit": 20, "skip": random.randrange(rows)})]
+
+    async def get(client, user):
+        return [await timed(client, "get", "GET", f"/students/{random.randint(1, rows)}")]
+
+    async def search(client, user):
+        return [await timed(client, "search", "GET", "/students/search", params={"q": f"{random.randrange(rows)}"})]
+
+    async def create(client, user):
+        n = next(counter)
+        body = {"name": f"Load {n}", "age": 20, "email": f"load{n}@example.com", "grades": [80.0, 90.0]}
+        return [await timed(client, "create", "POST", "/students/", json=body, headers=admin)]
+
+    return {"login": login, "list": list_page, "get": get, "search": search, "create": create}
+
+
+def ecommerce_operations(state: Dict) -> Dict[str, Callable]:
+    rows = state["rows"]
+    admin = state["headers"][0]
+    counter = itertools.count()
+
+    async def login(client, user):
+        form = {"username": f"user{user}", "password": BENCH_PASSWORD}
+        return [await timed(client, "login", "POST", "/auth/token", data=form)]
+
+    async def list_page(client, user):
+        return [await timed(client, "list", "GET", "/products/", params={"limit": 20, "skip": random.randrange(rows)})]
+
+    async def get(client, user):
+        return [await timed(client, "get", "GET", f"/products/{random.randint(1, rows)}")]
+
+    async def search(client, user):
+        return [await timed(client, "search", "GET", "/products/search", params={"q": f"{random.randrange(rows)}"})]
+
+    async def create(client, user):
+        body = {"name": f"Load product {next(counter)}", "price": 5.0, "stock": 1_000_000}
+        return [await timed(client, "create", "POST", "/admin/products/", json=body, headers=admin)]
+
+    async def add_to_cart(client, user):
+        body = {"product_id": random.randint(1, rows), "quantity": 1}
+        return [await timed(client, "add_to_cart", "POST", "/cart/add/", json=body, headers=state["headers"][user])]
+
+    async def checkout(client, user):
+        samples = await add_to_cart(client, user)
+        samples.append(await timed(client, "checkout", "POST", "/cart/checkout/", headers=state["headers"][user]))
+        return samples
+
+    return {"login": login, "list": list_page, "get": get, "search": search, "create": create,
+            "add_to_cart": add_to_cart, "checkout": checkout}
+
+
+async def drive(app, operations: Dict[str, Callable], names: List[str], weights: List[int],
+                concurrency: int, total: int, warmup: int) -> Dict:
+    samples: List[Sample] = []
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def run(count: int, record: bool):
+            remaining = iter(range(count))
+
+            async def user_loop(user: int):
+                for _ in remaining:
+                    operation = operations[random.choices(names, weights)[0]]
+                    result = await operation(client, user)
+                    if record:
+                        samples.extend(result)
+
+            await asyncio.gather(*(user_loop(user) for user in range(concurrency)))
+
+        await run(warmup, record=False)
+        start = time.perf_counter()
+        await run(total, record=True)
+        elapsed = time.perf_counter() - start
+
+    routes = {}
+    for label in sorted({sample[0] for sample in samples}):
+        latencies = [seconds for name, _, seconds in samples if name == label]
+        statuses: Dict[str, int] = {}
+        for name, status, _ in samples:
+            if name == label:
+                statuses[str(status)] = statuses.get(str(status), 0) + 1
+        routes[label] = {
+            **summarize(latencies),
+            "requests_per_s": round(len(latencies) / elapsed, 1),
+            "errors": sum(count for status, count in statuses.items() if int(status) >= 400),
+            "statuses": statuses,
+        }
+    return {
+        "requests": len(samples),
+        "elapsed_s": round(elapsed, 3),
+        "requests_per_s": round(len(samples) / elapsed, 1),
+        "latency": summarize([sample[2] for sample in samples]),
+        "routes": routes,
+    }
+
+
+def run_worker(args: argparse.Namespace) -> Dict:
+    random.seed(args.seed)
+    rows = args.rows or SCALES[args.scale]
+    package = load_app_package(args.app)
+    seed_start = time.perf_counter()
+    if args.app == "students":
+        state = seed_students(package, rows)
+        operations = student_operations(state)
+    else:
+        state = seed_ecommerce(package, rows, users=args.concurrency)
+        operations = ecommerce_operations(state)
+    seed_seconds = time.perf_counter() - seed_start
+
+    names, weights = parse_mix(args.mix or DEFAULT_MIX[args.app], operations)
+    app = submodule(package, "main").app
+    result = asyncio.run(drive(app, operations, names, weights, args.concurrency, args.requests, args.warmup))
+    return {
+        "app": args.app,
+        "rows": rows,
+        "seed_s": round(seed_seconds, 3),
+        "concurrency": args.concurrency,
+        "mix": dict(zip(names, weights)),
+        "db_mode": os.environ.get("DB_MODE", "sync"),
+        "db_profile": os.environ.get("DB_PROFILE", "wal"),
+        **result,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(args: argparse.Namespace) -> Dict:
+    apps = sorted(APPS) if args.app == "all" else [args.app]
+    results = {}
+    for app_name in apps:
+        command = [sys.executable, os.path.abspath(__file__), "--worker", "--app", app_name,
+                   "--scale", args.scale, "--concurrency", str(args.concurrency),
+                   "--requests", str(args.requests), "--warmup", str(args.warmup), "--seed", str(args.seed)]
+        if args.rows:
+            command += ["--rows", str(args.rows)]
+        if args.mix:
+            command += ["--mix", args.mix]
+        # The student app echoes every request to the console by default.
+        env = {**os.environ, "REQUEST_LOG_CONSOLE": "0"}
+        output = subprocess.run(command, env=env, check=True, capture_output=True, text=True).stdout
+        results[app_name] = json.loads(output)
+    return {"benchmark": "load_test", "commit": git_commit(), "apps": results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--app", choices=sorted(APPS) + ["all"], default="all")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small", help="rows seeded per table")
+    parser.add_argument("--rows", type=int, help="override the row count of --scale")
+    parser.add_argument("--concurrency", type=int, default=50, help="concurrent virtual users")
+    parser.add_argument("--requests", type=int, default=5000, help="operations measured per app")
+    parser.add_argument("--warmup", type=int, default=200, help="operations run before measuring")
+    parser.add_argument("--mix", help='operation weights, e.g. "get=60,list=30,create=10"')
+    parser.add_argument("--seed", type=int, default=1, help="random seed for the operation mix")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+    result = run_worker(arguments) if arguments.worker else main(arguments)
+    text = json.dumps(result, indent=2)
+    if arguments.output and not arguments.worker:
+        with open(arguments.output, "w") as f:
+            f.write(text + "\n")
+    print(text)
@@ -0,0 +1,96 @@
+"""
+Latency of ``GET /products/`` while a login storm is running (E-commerce app).
+
+Drives the app in-process through httpx's ASGI transport, so the event loop
+under test is the one running this script. Phase one measures catalog reads
+alone, phase two repeats them while ``--login-workers`` clients hammer
+``POST /auth/token``. Pass ``--inline-hashing`` to run bcrypt on the event
+loop (the previous behaviour) for comparison.
+
+Usage:
+    pip install httpx
+    python benchmarks/login_storm.py --requests 200 --login-workers 8
+"""
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List
+
+import httpx
+
+from common import load_app_package, submodule, summarize
+
+
+async def read_catalog(client: httpx.AsyncClient, total: int, concurrency: int) -> List[float]:
+    latencies: List[float] = []
+    remaining = iter(range(total))
+
+    async def worker():
+        for _ in remaining:
+            start = time.perf_counter()
+            await client.get("/products/", params={"limit": 10})
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies
+
+
+async def login_storm(client: httpx.AsyncClient, stop: asyncio.Event, counts: Dict[str, int]):
+    while not stop.is_set():
+        try:
+            response = await client.post("/auth/token", data={"username": "bench", "password": "bench-password"})
+            outcome = str(response.status_code)
+        except Exception as exc:
+            outcome = type(exc).__name__
+        counts[outcome] = counts.get(outcome, 0) + 1
+
+
+async def main(args: argparse.Namespace) -> Dict:
+    package = load_app_package("ecommerce")
+    main_module = submodule(package, "main")
+    auth = submodule(package, "auth")
+
+    if args.inline_hashing:
+        async def inline(func, *func_args):
+            return func(*func_args)
+        auth.password_pool.run = inline
+
+    transport = httpx.ASGITransport(app=main_module.app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/auth/register", json={
+            "name": "Bench", "username": "bench", "email": "bench@example.com",
+            "password": "bench-password", "age": 30, "is_admin": True,
+        })
+        token = (await client.post("/auth/token", data={"username": "bench", "password": "bench-password"})).json()
+        headers = {"Authorization": f"Bearer {token['access_token']}"}
+        for i in range(20):
+            await client.post("/admin/products/", json={"name": f"product-{i}", "price": 9.99, "stock": 100}, headers=headers)
+
+        idle = await read_catalog(client, args.requests, args.concurrency)
+
+        stop = asyncio.Event()
+        login_counts: Dict[str, int] = {}
+        storm = [asyncio.create_task(login_storm(client, stop, login_counts)) for _ in range(args.login_workers)]
+        await asyncio.sleep(0.05)
+        loaded = await read_catalog(client, args.requests, args.concurrency)
+        stop.set()
+        await asyncio.gather(*storm)
+
+    return {
+        "benchmark": "login_storm",
+        "inline_hashing": args.inline_hashing,
+        "login_workers": args.login_workers,
+        "get_products_idle": summarize(idle),
+        "get_products_during_logins": summarize(loaded),
+        "login_status_counts": login_counts,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--login-workers", type=int, default=8)
+    parser.add_argument("--inline-hashing", action="store_true")
+    print(json.dumps(asyncio.run(main(parser.parse_args())), indent=2))
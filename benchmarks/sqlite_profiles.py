@@ -0,0 +1,105 @@
+"""
+Mixed read/write throughput of the SQLite engine profiles (E-commerce app).
+
+For each profile (``DB_PROFILE``) a subprocess seeds the catalog, then runs
+``--readers`` threads reading products through the read-only pool and
+``--writers`` threads updating stock through the write pool for
+``--duration`` seconds. "legacy" is the previous plain SQLite setup.
+
+Usage:
+    python benchmarks/sqlite_profiles.py --readers 8 --writers 2 --duration 5
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List
+
+from sqlalchemy import insert
+
+from common import load_app_package, submodule, summarize
+
+PROFILES = ("legacy", "wal")
+
+
+def run_worker(args: argparse.Namespace) -> Dict:
+    package = load_app_package("ecommerce")
+    utils = submodule(package, "utils")
+    crud = submodule(package, "crud.product")
+    product_model = submodule(package, "models").Product
+    with utils.SessionLocal() as db:
+        db.execute(insert(product_model), [
+            {"name": f"Product {i}", "price": 1.0 + i % 100, "stock": 1_000_000} for i in range(args.rows)
+        ])
+        db.commit()
+
+    stop = threading.Event()
+    latencies: Dict[str, List[float]] = {"read": [], "write": []}
+    errors: Dict[str, int] = {"read": 0, "write": 0}
+    lock = threading.Lock()
+
+    def loop(kind: str) -> None:
+        session_factory = utils.ReadSessionLocal if kind == "read" else utils.SessionLocal
+        samples, failed = [], 0
+        while not stop.is_set():
+            product_id = random.randint(1, args.rows)
+            start = time.perf_counter()
+            try:
+                with session_factory() as db:
+                    if kind == "read":
+                        crud.get_product(product_id, db)
+                        crud.get_products(db, skip=random.randrange(args.rows), limit=20)
+                    else:
+                        crud.update_product_stock(product_id, random.choice((-1, 1)), db)
+            except Exception:
+                failed += 1
+            samples.append(time.perf_counter() - start)
+        with lock:
+            latencies[kind].extend(samples)
+            errors[kind] += failed
+
+    threads = [threading.Thread(target=loop, args=("read",)) for _ in range(args.readers)]
+    threads += [threading.Thread(target=loop, args=("write",)) for _ in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    return {
+        "profile": os.environ.get("DB_PROFILE", "wal"),
+        "reads_per_s": round(len(latencies["read"]) / args.duration, 1),
+        "writes_per_s": round(len(latencies["write"]) / args.duration, 1),
+        "read_latency": summarize(latencies["read"]),
+        "write_latency": summarize(latencies["write"]),
+        "errors": errors,
+    }
+
+
+def main(args: argparse.Namespace) -> Dict:
+    results = []
+    for profile in PROFILES:
+        command = [sys.executable, os.path.abspath(__file__), "--worker",
+                   "--rows", str(args.rows), "--readers", str(args.readers),
+                   "--writers", str(args.writers), "--duration", str(args.duration)]
+        output = subprocess.run(command, env={**os.environ, "DB_PROFILE": profile},
+                                check=True, capture_output=True, text=True).stdout
+        results.append(json.loads(output))
+    return {"benchmark": "sqlite_profiles", "readers": args.readers, "writers": args.writers, "results": results}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+    result = run_worker(arguments) if arguments.worker else main(arguments)
+    print(json.dumps(result, indent=2))
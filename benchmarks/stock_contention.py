@@ -0,0 +1,154 @@
+"""
+Flash-sale contention on one product: checks for oversell and reports reservations/sec.
+
+Seeds a fresh SQLite database with one product holding ``--stock`` units,
+then starts ``--processes`` worker processes on that database. Each worker
+drives the E-commerce app in-process through httpx's ASGI transport with
+``--concurrency`` virtual users, all adding one unit of the product to
+their carts until ``--attempts`` requests (split across the workers) have
+been made. Afterwards the database is checked: successful adds must equal
+the units in carts, and stock sold plus stock left must equal the initial
+stock. Pass ``--hot`` to serve the product from the in-memory striped
+counter (HOT_SKUS) instead of one conditional UPDATE per request.
+
+Usage:
+    pip install httpx
+    python benchmarks/stock_contention.py --stock 2000 --attempts 4000 --processes 4 --concurrency 16
+    DB_MODE=async python benchmarks/stock_contention.py --hot
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Dict
+
+import httpx
+from sqlalchemy import func, insert, select
+
+from common import APPS, REPO_ROOT, load_app_package, submodule, summarize
+
+PRODUCT_ID = 1
+
+
+def seed(args: argparse.Namespace) -> str:
+    package = load_app_package("ecommerce")
+    models = submodule(package, "models")
+    with submodule(package, "utils").SessionLocal() as db:
+        db.execute(insert(models.User), [
+            {"name": f"Buyer {i}", "age": 30, "email": f"buyer{i}@example.com", "username": f"buyer{i}",
+             "hashed_password": "-", "is_active": True, "is_admin": False}
+            for i in range(args.processes * args.concurrency)
+        ])
+        db.execute(insert(models.Product), [{"id": PRODUCT_ID, "name": "Flash sale item", "price": 1.0,
+                                             "stock": args.stock}])
+        db.commit()
+    return os.getcwd()
+
+
+def import_app(db_dir: str):
+    project_dir, package_name = APPS["ecommerce"]
+    os.chdir(db_dir)
+    sys.path.insert(0, os.path.join(REPO_ROOT, project_dir))
+    return importlib.import_module(package_name)
+
+
+async def buy(app, tokens, attempts: int) -> Dict:
+    statuses: Dict[str, int] = {}
+    latencies = []
+    remaining = iter(range(attempts))
+    transport = httpx.ASGITransport(app=app)
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        async def user_loop(token: str):
+            headers = {"Authorization": f"Bearer {token}"}
+            for _ in remaining:
+                start = time.perf_counter()
+                response = await client.post("/cart/add/", json={"product_id": PRODUCT_ID, "quantity": 1},
+                                             headers=headers)
+                latencies.append(time.perf_counter() - start)
+                statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(user_loop(token) for token in tokens))
+        elapsed = time.perf_counter() - start
+    return {"statuses": statuses, "elapsed_s": elapsed, "latency": summarize(latencies)}
+
+
+def run_worker(args: argparse.Namespace) -> Dict:
+    package = import_app(args.db_dir)
+    app = submodule(package, "main").app
+    auth = submodule(package, "auth")
+    first = args.worker_index * args.concurrency
+    tokens = [auth.create_access_token(data={"sub": f"buyer{i}"}) for i in range(first, first + args.concurrency)]
+    result = asyncio.run(buy(app, tokens, args.attempts // args.processes))
+    # Return units still leased by the hot counter, as shutdown would.
+    submodule(package, "crud.product").hot_stock.flush()
+    return result
+
+
+def main(args: argparse.Namespace) -> Dict:
+    db_dir = seed(args)
+    env = {**os.environ}
+    if args.hot:
+        env["HOT_SKUS"] = str(PRODUCT_ID)
+    workers = [
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--worker", "--db-dir", db_dir,
+             "--worker-index", str(index), "--processes", str(args.processes),
+             "--concurrency", str(args.concurrency), "--attempts", str(args.attempts)],
+            env=env, stdout=subprocess.PIPE, text=True,
+        )
+        for index in range(args.processes)
+    ]
+    start = time.perf_counter()
+    results = [json.loads(worker.communicate()[0]) for worker in workers]
+    elapsed = time.perf_counter() - start
+
+    statuses: Dict[str, int] = {}
+    for result in results:
+        for status, count in result["statuses"].items():
+            statuses[status] = statuses.get(status, 0) + count
+    reserved = statuses.get("201", 0)
+
+    package = import_app(db_dir)
+    models = submodule(package, "models")
+    with submodule(package, "utils").SessionLocal() as db:
+        stock_left = db.get(models.Product, PRODUCT_ID).stock
+        in_carts = db.execute(select(func.coalesce(func.sum(models.Cart.quantity), 0))).scalar_one()
+
+    return {
+        "benchmark": "stock_contention",
+        "db_mode": os.environ.get("DB_MODE", "sync"),
+        "hot_counter": args.hot,
+        "processes": args.processes,
+        "concurrency": args.concurrency,
+        "initial_stock": args.stock,
+        "attempts": sum(sum(result["statuses"].values()) for result in results),
+        "statuses": statuses,
+        "reserved": reserved,
+        "units_in_carts": in_carts,
+        "stock_left": stock_left,
+        "oversold": max(0, in_carts - args.stock),
+        "consistent": reserved == in_carts and in_carts + stock_left == args.stock,
+        "elapsed_s": round(elapsed, 3),
+        "reservations_per_s": round(reserved / elapsed, 1),
+        "latency_per_worker": [result["latency"] for result in results],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--stock", type=int, default=2000, help="initial stock of the product")
+    parser.add_argument("--attempts", type=int, default=4000, help="add-to-cart requests across all workers")
+    parser.add_argument("--processes", type=int, default=4, help="worker processes sharing the database")
+    parser.add_argument("--concurrency", type=int, default=16, help="virtual users per worker")
+    parser.add_argument("--hot", action="store_true", help="serve the product from the striped in-memory counter")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--db-dir", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-index", type=int, default=0, help=argparse.SUPPRESS)
+    arguments = parser.parse_args()
+    print(json.dumps(run_worker(arguments) if arguments.worker else main(arguments), indent=2))
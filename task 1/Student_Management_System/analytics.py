@@ -0,0 +1,218 @@
+import threading
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+from fastapi import HTTPException
+from sqlalchemy import String, select, type_coerce
+from sqlalchemy.orm import Session
+from .models.student import Student
+from .schemas.analytics import AgeBucket, CohortSummary, GradeStats, HistogramBin, StudentGradeStats
+
+PERCENTILES = (10, 25, 50, 75, 90, 95, 99)
+LOAD_BATCH_SIZE = 10_000
+COHORT_CACHE_SIZE = 64
+
+
+class GradeColumns:
+    """
+    Grades of a set of students laid out as flat NumPy arrays.
+
+    ``values`` holds every grade back to back; ``counts[i]`` is the number of
+    grades belonging to the i-th student and ``ages[i]`` their age.
+    """
+
+    def __init__(self, values: np.ndarray, counts: np.ndarray, ages: np.ndarray):
+        self.values = values
+        self.counts = counts
+        self.ages = ages
+
+    def student_means(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Return (mean grade, age) for every student that has grades."""
+        has_grades = self.counts > 0
+        if not has_grades.any():
+            return np.empty(0), np.empty(0, dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(self.counts)[:-1]))
+        sums = np.add.reduceat(self.values, offsets[has_grades])
+        return sums / self.counts[has_grades], self.ages[has_grades]
+
+
+def _parse_grade_lists(texts: Sequence[Optional[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Parse raw JSON grade lists (e.g. ``"[85.5, 92.0]"``) into (values, counts).
+
+    All lists are concatenated and parsed by NumPy in one pass, which is much
+    cheaper than json.loads() per row.
+    """
+    lists = [text[1:-1] if text and text[0] == "[" and len(text) > 2 else "" for text in texts]
+    counts = np.fromiter((text.count(",") + 1 if text else 0 for text in lists), dtype=np.int64, count=len(lists))
+    joined = ",".join(text for text in lists if text)
+    values = np.fromstring(joined, sep=",") if joined else np.empty(0)
+    return values, counts
+
+
+def load_grade_columns(
+        db: Session,
+        min_age: Optional[int] = None,
+        max_age: Optional[int] = None
+) -> GradeColumns:
+    """
+    Load the JSON grades column into flat arrays, LOAD_BATCH_SIZE rows at a time.
+
+    Args:
+        db: Database session.
+        min_age: Only include students at least this old.
+        max_age: Only include students at most this old.
+
+    Returns:
+        GradeColumns for the matching students.
+    """
+    # Fetch the stored JSON text as-is; decoding happens in bulk below.
+    raw_grades = type_coerce(Student.grades, String)
+    statement = select(Student.age, raw_grades).execution_options(yield_per=LOAD_BATCH_SIZE)
+    if min_age is not None:
+        statement = statement.where(Student.age >= min_age)
+    if max_age is not None:
+        statement = statement.where(Student.age <= max_age)
+
+    values, counts, ages = [], [], []
+    for batch in db.execute(statement).partitions():
+        batch_ages, batch_texts = zip(*batch)
+        batch_values, batch_counts = _parse_grade_lists(batch_texts)
+        values.append(batch_values)
+        counts.append(batch_counts)
+        ages.append(np.fromiter(batch_ages, dtype=np.int64, count=len(batch_ages)))
+
+    if not counts:
+        return GradeColumns(np.empty(0), np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64))
+    return GradeColumns(np.concatenate(values), np.concatenate(counts), np.concatenate(ages))
+
+
+def describe(values: np.ndarray) -> GradeStats:
+    """Summary statistics of a 1-D array of grades."""
+    if values.size == 0:
+        return GradeStats(count=0)
+    percentiles = np.percentile(values, PERCENTILES)
+    return GradeStats(
+        count=int(values.size),
+        mean=float(values.mean()),
+        median=float(np.median(values)),
+        std=float(values.std()),
+        min=float(values.min()),
+        max=float(values.max()),
+        percentiles={f"p{pct}": float(value) for pct, value in zip(PERCENTILES, percentiles)},
+    )
+
+
+def summarize_cohort(columns: GradeColumns, bins: int = 10) -> CohortSummary:
+    """
+    Cohort statistics: all grades, per-student means, a histogram of grades
+    and the mean of student averages by age.
+    """
+    means, mean_ages = columns.student_means()
+
+    histogram = []
+    if columns.values.size:
+        bin_counts, edges = np.histogram(columns.values, bins=bins)
+        histogram = [
+            HistogramBin(lower=float(edges[i]), upper=float(edges[i + 1]), count=int(bin_counts[i]))
+            for i in range(len(bin_counts))
+        ]
+
+    by_age = []
+    if means.size:
+        unique_ages, inverse = np.unique(mean_ages, return_inverse=True)
+        students_per_age = np.bincount(inverse)
+        mean_per_age = np.bincount(inverse, weights=means) / students_per_age
+        by_age = [
+            AgeBucket(age=int(age), students=int(students), mean=float(mean))
+            for age, students, mean in zip(unique_ages, students_per_age, mean_per_age)
+        ]
+
+    return CohortSummary(
+        students=int(columns.counts.size),
+        students_with_grades=int(means.size),
+        grades=describe(columns.values),
+        student_means=describe(means),
+        histogram=histogram,
+        by_age=by_age,
+    )
+
+
+class CohortCache:
+    """
+    Cache of cohort summaries keyed by query parameters.
+
+    Any student write calls invalidate(), which drops every entry.
+    """
+
+    def __init__(self, maxsize: int = COHORT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._entries: Dict[tuple, CohortSummary] = {}
+        self._version = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[CohortSummary]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def version(self) -> int:
+        with self._lock:
+            return self._version
+
+    def put(self, key: tuple, summary: CohortSummary, version: int) -> None:
+        """Store a summary unless a write happened since it was computed."""
+        with self._lock:
+            if version != self._version:
+                return
+            if len(self._entries) >= self.maxsize:
+                self._entries.clear()
+            self._entries[key] = summary
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+
+cohort_cache = CohortCache()
+
+
+def get_cohort_summary(
+        db: Session,
+        min_age: Optional[int] = None,
+        max_age: Optional[int] = None,
+        bins: int = 10
+) -> CohortSummary:
+    """
+    Return (cached) grade statistics for the students in an age range.
+
+    Args:
+        db: Database session.
+        min_age: Lower age bound, inclusive.
+        max_age: Upper age bound, inclusive.
+        bins: Number of histogram bins.
+
+    Returns:
+        CohortSummary for the cohort.
+    """
+    key = (min_age, max_age, bins)
+    summary = cohort_cache.get(key)
+    if summary is not None:
+        return summary
+    version = cohort_cache.version()
+    summary = summarize_cohort(load_grade_columns(db, min_age, max_age), bins)
+    cohort_cache.put(key, summary, version)
+    return summary
+
+
+def get_student_grade_stats(student_id: int, db: Session) -> StudentGradeStats:
+    """
+    Grade statistics for a single student.
+
+    Raises:
+        HTTPException: if the student is not found.
+    """
+    grades = db.execute(select(Student.grades).where(Student.id == student_id)).first()
+    if grades is None:
+        raise HTTPException(status_code=404, detail="Student not found")
+    values = np.asarray(grades[0] or [], dtype=np.float64)
+    return StudentGradeStats(student_id=student_id, grades=describe(values))
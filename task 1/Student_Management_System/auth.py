@@ -1,10 +1,13 @@
 import json, os
+import threading
 from datetime import timedelta, datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 from fastapi import Depends, HTTPException
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
 from .models.user import User
+from .password_pool import PasswordPool
+from .token_cache import TokenCache
 from passlib.context import  CryptContext
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -12,9 +15,12 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 SECRET_KEY = "your-secret-key-here"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+PASSWORD_HASH_WORKERS = 4
+PASSWORD_HASH_QUEUE_LIMIT = 64
+USERS_FILE = os.path.join(os.path.dirname(__file__), "users.json")
 
 
-def load_user() -> List[User]:
+def load_user(file_path: str = USERS_FILE) -> List[User]:
     """
     Load users from a JSON file.
     Return:
@@ -23,16 +29,73 @@ def load_user() -> List[User]:
         FileNotFoundError: If the user.json does not exist.
         JSONDecodeError: If the JSON file is not malformed.
     """
-    file_path = os.path.join(os.path.dirname(__file__), "users.json")
     try:
         if not os.path.exists(file_path):
             return []
         with open(file_path, "r") as file:
             data = json.load(file)
         return [User(**user_data) for user_data in data]
-    except json.JSONDecoderError:
+    except json.JSONDecodeError:
         raise HTTPException(status_code=500, detail="Invalid JSON format in users.json")
 
+
+class UserRegistry:
+    """
+    In-memory index of users.json keyed by username.
+
+    The file is parsed once and only re-read when its mtime or size changes,
+    or when reload() is called explicitly.
+    """
+
+    def __init__(self, file_path: str = USERS_FILE):
+        self.file_path = file_path
+        self._users: Dict[str, User] = {}
+        self._signature: Optional[Tuple[int, int]] = None
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def _stat_signature(self) -> Optional[Tuple[int, int]]:
+        """Return (mtime_ns, size) of the users file, or None if it is missing."""
+        try:
+            stat = os.stat(self.file_path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _refresh(self, force: bool = False) -> None:
+        """Rebuild the index if the file changed since the last load."""
+        signature = self._stat_signature()
+        if not force and self._loaded and signature == self._signature:
+            return
+        with self._lock:
+            signature = self._stat_signature()
+            if not force and self._loaded and signature == self._signature:
+                return
+            users = load_user(self.file_path)
+            self._users = {user.username: user for user in users}
+            self._signature = signature
+            self._loaded = True
+
+    def reload(self) -> None:
+        """Force a reload of the users file."""
+        self._refresh(force=True)
+
+    def get(self, username: str) -> Optional[User]:
+        """Look up a user by username."""
+        self._refresh()
+        return self._users.get(username)
+
+    def all(self) -> List[User]:
+        """Return every known user."""
+        self._refresh()
+        return list(self._users.values())
+
+
+user_registry = UserRegistry()
+token_cache = TokenCache()
+password_pool = PasswordPool(max_workers=PASSWORD_HASH_WORKERS, max_pending=PASSWORD_HASH_QUEUE_LIMIT)
+
+
 def get_user(username: str) -> Optional[User]:
     """
     Find a user by username.
@@ -41,12 +104,9 @@ def get_user(username: str) -> Optional[User]:
     username: Username to search for.
 
     Returns:
+        The User object if found, else None.
     """
-    users = load_user()
-    for user in users:
-        if user.username == username:
-            return user
-    return None
+    return user_registry.get(username)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -110,6 +170,12 @@ def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
     Raises:
         HTTPException: If token is invalid or user not found.
     """
+    cached_user = token_cache.get(token)
+    # A reload of users.json replaces the User objects, so a stale entry
+    # (e.g. a user deactivated since) falls through to full verification.
+    if cached_user is not None and user_registry.get(cached_user.username) is cached_user:
+        return cached_user
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
@@ -122,4 +188,7 @@ def get_current_user(token: str = Depends(oauth2_scheme)) -> User:
         raise HTTPException(status_code=404, detail="User not found")
     if not user.is_active:
         raise HTTPException(status_code=403, detail="Inactive user.")
+    expires_at = payload.get("exp")
+    if expires_at is not None:
+        token_cache.put(token, user, user.username, expires_at)
     return user
@@ -0,0 +1,143 @@
+import csv
+import json
+import time
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+from .crud.student import create_students_bulk
+from .schemas.student import StudentCreate, StudentImportResult, ImportRowError
+
+CSV_COLUMNS = ["name", "age", "email", "grades"]
+
+
+async def iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    """Split a streamed request body into text lines without buffering it whole."""
+    buffer = b""
+    async for chunk in chunks:
+        buffer += chunk
+        *lines, buffer = buffer.split(b"\n")
+        for line in lines:
+            yield line.decode("utf-8", errors="replace").rstrip("\r")
+    if buffer:
+        yield buffer.decode("utf-8", errors="replace").rstrip("\r")
+
+
+def parse_csv_row(line: str, header: List[str]) -> Dict:
+    """
+    Parse one CSV line into student fields.
+
+    Grades are a single column of ``;``-separated numbers, e.g. ``85.5;92``.
+    """
+    values = next(csv.reader([line]))
+    if len(values) != len(header):
+        raise ValueError(f"expected {len(header)} columns, got {len(values)}")
+    row = dict(zip(header, values))
+    grades = row.get("grades", "").strip()
+    row["grades"] = [grade for grade in grades.split(";") if grade.strip()] if grades else []
+    return row
+
+
+def parse_ndjson_row(line: str) -> Dict:
+    """Parse one NDJSON line into student fields."""
+    row = json.loads(line)
+    if not isinstance(row, dict):
+        raise ValueError("expected a JSON object")
+    return row
+
+
+def format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+    )
+
+
+async def iter_student_rows(
+        chunks: AsyncIterator[bytes],
+        fmt: str
+) -> AsyncIterator[Tuple[int, Optional[Dict], Optional[str]]]:
+    """
+    Yield (line number, validated student fields, error) for each data row.
+
+    Exactly one of the fields and the error is set. Blank lines are skipped.
+    """
+    header: Optional[List[str]] = None
+    line_number = 0
+    async for line in iter_lines(chunks):
+        line_number += 1
+        if not line.strip():
+            continue
+        if fmt == "csv" and header is None:
+            header = [column.strip().lower() for column in next(csv.reader([line]))]
+            missing = [column for column in CSV_COLUMNS[:3] if column not in header]
+            if missing:
+                yield line_number, None, f"CSV header is missing columns: {', '.join(missing)}"
+                return
+            continue
+        try:
+            raw = parse_csv_row(line, header) if fmt == "csv" else parse_ndjson_row(line)
+            student = StudentCreate(**raw)
+        except ValidationError as exc:
+            yield line_number, None, format_validation_error(exc)
+            continue
+        except (ValueError, csv.Error) as exc:
+            yield line_number, None, f"Malformed row: {exc}"
+            continue
+        yield line_number, student.model_dump(), None
+
+
+async def import_students(
+        chunks: AsyncIterator[bytes],
+        fmt: str,
+        batch_size: int,
+        db: Session
+) -> StudentImportResult:
+    """
+    Stream students from an NDJSON or CSV body into the database.
+
+    Rows are inserted in batches of ``batch_size``, one transaction each.
+    Bad rows are reported and skipped without aborting the load.
+
+    Args:
+        chunks: Request body chunks.
+        fmt: ``"ndjson"`` or ``"csv"``.
+        batch_size: Rows per transaction.
+        db: Database session.
+
+    Returns:
+        Counts, per-row errors and throughput of the import.
+    """
+    start = time.perf_counter()
+    inserted = 0
+    errors: List[ImportRowError] = []
+    batch: List[Tuple[int, Dict]] = []
+
+    def flush() -> None:
+        nonlocal inserted
+        results = create_students_bulk([student for _, student in batch], db)
+        for (line, _), error in zip(batch, results):
+            if error is None:
+                inserted += 1
+            else:
+                errors.append(ImportRowError(line=line, error=error))
+        batch.clear()
+
+    async for line, student, error in iter_student_rows(chunks, fmt):
+        if error is not None:
+            errors.append(ImportRowError(line=line, error=error))
+            continue
+        batch.append((line, student))
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+
+    elapsed = time.perf_counter() - start
+    errors.sort(key=lambda row_error: row_error.line)
+    total = inserted + len(errors)
+    return StudentImportResult(
+        inserted=inserted,
+        failed=len(errors),
+        errors=errors,
+        elapsed_seconds=round(elapsed, 4),
+        rows_per_second=round(total / elapsed, 1) if elapsed > 0 else 0.0,
+    )
@@ -1,15 +1,19 @@
 from .student import (
     create_student,
+    create_students_bulk,
     get_student,
     get_students,
+    get_top_students,
     update_student,
     delete_student
 )
 
 __all__ = [
     "create_student",
+    "create_students_bulk",
     "get_student", 
     "get_students",
+    "get_top_students",
     "update_student",
     "delete_student"
 ]
\ No newline at end of file
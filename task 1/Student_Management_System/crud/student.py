@@ -1,9 +1,87 @@
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 from fastapi import HTTPException
+from sqlalchemy import delete, insert, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from ..models.student import Student
+from ..schemas.student import StudentResponse
+from ..analytics import cohort_cache
+from ..etag import ResourceVersions
+from ..response_cache import ResponseCache
+from ..search import FullTextIndex, build_match_query
 
+STUDENT_EXPORT_COLUMNS = ["id", "name", "age", "email", "grades"]
+STUDENT_RESPONSE_CACHE_SIZE = 10_000
+
+student_versions = ResourceVersions("students")
+student_response_cache = ResponseCache(STUDENT_RESPONSE_CACHE_SIZE)
+student_search_index = FullTextIndex("student_fts", "student", ["name", "email"])
+
+
+def record_student_write(*student_ids: int) -> None:
+    """
+    Invalidate everything derived from the student table after a commit.
+
+    Args:
+        student_ids: IDs of the rows that changed, when known.
+    """
+    cohort_cache.invalidate()
+    student_versions.bump(*student_ids)
+    student_response_cache.invalidate(*student_ids)
+
+
+def cache_student_response(student: Student, etag: str) -> bytes:
+    """
+    Serialize a student as a StudentResponse body and cache it.
+
+    Args:
+        student: The student, read after ``etag`` was taken.
+        etag: The row's ETag at the time of the read.
+
+    Returns:
+        The JSON body.
+    """
+    body = StudentResponse.model_validate(student, from_attributes=True).model_dump_json().encode()
+    student_response_cache.put(student.id, etag, body)
+    return body
+
+
+def sync_student_search(db: Session, *student_ids: int) -> None:
+    """
+    Update the search index for the given students in the current transaction.
+
+    Args:
+        db: Database session.
+        student_ids: IDs of the created, updated or deleted students.
+    """
+    for statement in student_search_index.sync_statements(student_ids):
+        db.execute(statement)
+
+
+def _sync_student_search_by_email(db: Session, emails: List[str]) -> None:
+    """Index newly inserted students whose IDs are not known yet."""
+    ids = db.execute(select(Student.id).where(Student.email.in_(emails))).scalars().all()
+    sync_student_search(db, *ids)
+
+
+def summarize_grades(grades: Optional[List[float]]) -> dict:
+    """
+    Compute the derived grade columns stored alongside the grades list.
+
+    Args:
+        grades: The student's grades.
+
+    Returns:
+        Values for grade_average, grade_count, grade_min and grade_max.
+    """
+    if not grades:
+        return {"grade_average": None, "grade_count": 0, "grade_min": None, "grade_max": None}
+    return {
+        "grade_average": sum(grades) / len(grades),
+        "grade_count": len(grades),
+        "grade_min": min(grades),
+        "grade_max": max(grades),
+    }
 
 def create_student(student: Student, db: Session) -> Student:
     """ Create  a new  student  in the database.
@@ -18,16 +96,68 @@ def create_student(student: Student, db: Session) -> Student:
     Raises:
         HTTPException: if the email is already in use (duplicate).
         """
-    db_student = Student(**student.model_dump())
+    db_student = Student(**{**student.model_dump(), **summarize_grades(student.grades)})
     db.add(db_student)
     try:
+        db.flush()
+        sync_student_search(db, db_student.id)
         db.commit()
         db.refresh(db_student)
+        record_student_write(db_student.id)
         return db_student
     except IntegrityError:
         db.rollback()
         raise HTTPException(status_code=400, detail="Email already exists")
 
+def create_students_bulk(students: List[dict], db: Session) -> List[Optional[str]]:
+    """
+    Insert a batch of students in a single transaction.
+
+    Rows whose email already exists (in the table or earlier in the batch)
+    are skipped; the rest are written with one executemany INSERT.
+
+    Args:
+        students: Validated student fields (name, age, email, grades).
+        db: Database session.
+
+    Returns:
+        One entry per input row: None if inserted, else the error message.
+    """
+    errors: List[Optional[str]] = [None] * len(students)
+    emails = [student["email"] for student in students]
+    existing = set(db.execute(select(Student.email).where(Student.email.in_(emails))).scalars())
+
+    seen = set()
+    pending = []
+    for index, student in enumerate(students):
+        if student["email"] in existing or student["email"] in seen:
+            errors[index] = "Email already exists"
+            continue
+        seen.add(student["email"])
+        pending.append((index, {**student, **summarize_grades(student.get("grades"))}))
+
+    if not pending:
+        db.rollback()
+        return errors
+    try:
+        db.execute(insert(Student), [student for _, student in pending])
+        _sync_student_search_by_email(db, [student["email"] for _, student in pending])
+        db.commit()
+        record_student_write()
+    except IntegrityError:
+        db.rollback()
+        # A concurrent writer claimed one of the emails; fall back to row by row.
+        for index, student in pending:
+            try:
+                db.execute(insert(Student), [student])
+                _sync_student_search_by_email(db, [student["email"]])
+                db.commit()
+            except IntegrityError:
+                db.rollback()
+                errors[index] = "Email already exists"
+        record_student_write()
+    return errors
+
 def get_student(student_id: int, db: Session) -> Student:
     """
     Retrieve a student by ID.
@@ -48,20 +178,90 @@ def get_student(student_id: int, db: Session) -> Student:
         raise HTTPException(status_code=404, detail="Student not found")
     return student
 
-def get_students(db: Session, skip: int = 0, limit: int = 10) -> List[Student]:
+def get_students(
+        db: Session,
+        skip: int = 0,
+        limit: int = 10,
+        after_id: Optional[int] = None,
+        min_average: Optional[float] = None
+) -> List[Student]:
     """
     retrieve a list of students with pagination.
 
     Args:
         db: Database session.
-        skip: Number of students to skip.
+        skip: Number of students to skip (ignored when after_id is given).
         limit: Maximum number of records to return.
+        after_id: Keyset cursor; only students with a greater ID are returned.
+        min_average: Only return students whose grade average is at least this.
+
+    Returns:
+        List of Student objects ordered by ID.
+    """
+
+    query = db.query(Student).order_by(Student.id)
+    if min_average is not None:
+        query = query.filter(Student.grade_average >= min_average)
+    if after_id is not None:
+        return query.filter(Student.id > after_id).limit(limit).all()
+    return query.offset(skip).limit(limit).all()
+
+def get_top_students(db: Session, limit: int = 50) -> List[Student]:
+    """
+    Retrieve the students with the highest grade average.
+
+    Args:
+        db: Database session.
+        limit: Number of students to return.
+
+    Returns:
+        Students with grades, best average first (ties broken by ID).
+    """
+    return (
+        db.query(Student)
+        .filter(Student.grade_average.is_not(None))
+        .order_by(Student.grade_average.desc(), Student.id)
+        .limit(limit)
+        .all()
+    )
+
+def search_students(db: Session, q: str, skip: int = 0, limit: int = 10) -> List[Student]:
+    """
+    Full-text search over student names and emails.
+
+    Args:
+        db: Database session.
+        q: Search text; every word is matched as a prefix.
+        skip: Number of results to skip.
+        limit: Maximum number of results to return.
 
     Returns:
-        List of Student objects.
+        Matching students, best match first.
     """
+    query = build_match_query(q)
+    if query is None:
+        return []
+    statement = select(Student).from_statement(student_search_index.search_statement())
+    return list(db.execute(statement, {"query": query, "limit": limit, "skip": skip}).scalars().all())
 
-    return db.query(Student).offset(skip).limit(limit).all()
+def iter_students_for_export(db: Session, batch_size: int = 1000) -> Iterator[Tuple]:
+    """
+    Stream every student as a tuple of STUDENT_EXPORT_COLUMNS, ordered by ID.
+
+    Selects plain columns (no ORM objects) and fetches ``batch_size`` rows
+    at a time, so memory stays flat regardless of table size.
+
+    Args:
+        db: Database session.
+        batch_size: Rows fetched from the cursor per round.
+
+    Yields:
+        One tuple per student.
+    """
+    columns = [getattr(Student, column) for column in STUDENT_EXPORT_COLUMNS]
+    statement = select(*columns).order_by(Student.id).execution_options(yield_per=batch_size)
+    for row in db.execute(statement):
+        yield tuple(row)
 
 def update_student(student_id: int, student_update: Student, db: Session) -> Student:
     """
@@ -83,11 +283,20 @@ def update_student(student_id: int, student_update: Student, db: Session) -> Stu
         raise HTTPException(status_code=404, detail="Student not found")
 
     update_data = student_update.model_dump(exclude_unset=True)
+    if "grades" in update_data:
+        update_data.update(summarize_grades(update_data["grades"]))
     for key, value in update_data.items():
         setattr(db_student, key, value)
     try:
+        if "name" in update_data or "email" in update_data:
+            db.flush()
+            sync_student_search(db, student_id)
         db.commit()
+        record_student_write(student_id)
+        # Write-through: the refreshed row is at least as new as this tag.
+        etag = student_versions.row_etag(student_id)
         db.refresh(db_student)
+        cache_student_response(db_student, etag)
         return db_student
     except IntegrityError:
         db.rollback()
@@ -108,4 +317,138 @@ def delete_student(student_id: int, db: Session) -> None:
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
     db.delete(student)
-    db.commit()
\ No newline at end of file
+    db.flush()
+    sync_student_search(db, student_id)
+    db.commit()
+    record_student_write(student_id)
+
+def _apply_student_updates(
+        items: List[dict],
+        rows: Dict[int, Student],
+        errors: List[Optional[Tuple[int, str]]],
+        db: Session,
+        savepoints: bool = False
+) -> List[int]:
+    """
+    Apply partial updates to loaded rows, recording per-item errors.
+
+    With ``savepoints`` every item is flushed in its own SAVEPOINT, so a
+    unique-constraint failure only discards that item.
+
+    Returns:
+        IDs of the rows that were changed.
+    """
+    updated = []
+    for index, item in enumerate(items):
+        if errors[index] is not None:
+            continue
+        db_student = rows.get(item["id"])
+        if db_student is None:
+            errors[index] = (404, "Student not found")
+            continue
+        changes = {key: value for key, value in item.items() if key != "id"}
+        if "grades" in changes:
+            changes.update(summarize_grades(changes["grades"]))
+        if not savepoints:
+            for key, value in changes.items():
+                setattr(db_student, key, value)
+            updated.append(db_student.id)
+            continue
+        try:
+            with db.begin_nested():
+                for key, value in changes.items():
+                    setattr(db_student, key, value)
+            updated.append(db_student.id)
+        except IntegrityError:
+            errors[index] = (400, "Email already exists")
+    return updated
+
+def update_students_bulk(items: List[dict], db: Session) -> List[Optional[Tuple[int, str]]]:
+    """
+    Apply partial updates to many students with one SELECT and one commit.
+
+    Target rows are loaded with a single IN query. Emails that would clash
+    with another student, or with another item of the batch, are rejected
+    up front.
+
+    Args:
+        items: Partial updates, each with the student ``id`` and the fields to set.
+        db: Database session.
+
+    Returns:
+        One entry per item: None if updated, else (status code, error message).
+    """
+    errors: List[Optional[Tuple[int, str]]] = [None] * len(items)
+    seen_ids = set()
+    for index, item in enumerate(items):
+        if item["id"] in seen_ids:
+            errors[index] = (400, "Duplicate id in batch")
+        seen_ids.add(item["id"])
+
+    ids = [item["id"] for item in items]
+    rows = {student.id: student for student in db.query(Student).filter(Student.id.in_(ids))}
+    # Unknown ids fail first, so they cannot claim an email another item needs.
+    for index, item in enumerate(items):
+        if errors[index] is None and item["id"] not in rows:
+            errors[index] = (404, "Student not found")
+
+    new_emails = [item["email"] for item in items if item.get("email") is not None]
+    owners = dict(db.execute(select(Student.email, Student.id).where(Student.email.in_(new_emails))).all())
+    claimed = set()
+    for index, item in enumerate(items):
+        email = item.get("email")
+        if email is None or errors[index] is not None:
+            continue
+        if owners.get(email, item["id"]) != item["id"] or email in claimed:
+            errors[index] = (400, "Email already exists")
+        else:
+            claimed.add(email)
+
+    try:
+        updated = _apply_student_updates(items, rows, errors, db)
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        # A concurrent writer claimed one of the emails; isolate each item.
+        rows = {student.id: student for student in db.query(Student).filter(Student.id.in_(ids))}
+        updated = _apply_student_updates(items, rows, errors, db, savepoints=True)
+    if not updated:
+        db.rollback()
+        return errors
+    sync_student_search(db, *updated)
+    db.commit()
+    record_student_write(*updated)
+    return errors
+
+def delete_students_bulk(ids: List[int], db: Session) -> List[Optional[Tuple[int, str]]]:
+    """
+    Delete many students with one SELECT, one DELETE and one commit.
+
+    Args:
+        ids: IDs of the students to delete.
+        db: Database session.
+
+    Returns:
+        One entry per ID: None if deleted, else (status code, error message).
+    """
+    existing = set(db.execute(select(Student.id).where(Student.id.in_(ids))).scalars())
+    errors: List[Optional[Tuple[int, str]]] = []
+    seen = set()
+    for student_id in ids:
+        if student_id in seen:
+            errors.append((400, "Duplicate id in batch"))
+        elif student_id not in existing:
+            errors.append((404, "Student not found"))
+        else:
+            errors.append(None)
+        seen.add(student_id)
+
+    if not existing:
+        db.rollback()
+        return errors
+    deleted = sorted(existing)
+    db.execute(delete(Student).where(Student.id.in_(deleted)))
+    sync_student_search(db, *deleted)
+    db.commit()
+    record_student_write(*deleted)
+    return errors
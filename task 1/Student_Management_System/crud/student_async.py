@@ -0,0 +1,101 @@
+from typing import List, Optional
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.student import Student
+from ..search import build_match_query
+from .student import (
+    cache_student_response,
+    record_student_write,
+    student_search_index,
+    student_versions,
+    summarize_grades,
+)
+
+
+async def sync_student_search(db: AsyncSession, *student_ids: int) -> None:
+    """Async equivalent of crud.student.sync_student_search."""
+    for statement in student_search_index.sync_statements(student_ids):
+        await db.execute(statement)
+
+async def create_student(student: Student, db: AsyncSession) -> Student:
+    """Async equivalent of crud.student.create_student."""
+    db_student = Student(**{**student.model_dump(), **summarize_grades(student.grades)})
+    db.add(db_student)
+    try:
+        await db.flush()
+        await sync_student_search(db, db_student.id)
+        await db.commit()
+        await db.refresh(db_student)
+        record_student_write(db_student.id)
+        return db_student
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Email already exists")
+
+async def get_student(student_id: int, db: AsyncSession) -> Student:
+    """Async equivalent of crud.student.get_student."""
+    student = await db.get(Student, student_id)
+    if not student:
+        raise HTTPException(status_code=404, detail="Student not found")
+    return student
+
+async def get_students(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 10,
+        after_id: Optional[int] = None,
+        min_average: Optional[float] = None
+) -> List[Student]:
+    """Async equivalent of crud.student.get_students."""
+    statement = select(Student).order_by(Student.id)
+    if min_average is not None:
+        statement = statement.where(Student.grade_average >= min_average)
+    if after_id is not None:
+        statement = statement.where(Student.id > after_id)
+    else:
+        statement = statement.offset(skip)
+    result = await db.execute(statement.limit(limit))
+    return list(result.scalars().all())
+
+async def search_students(db: AsyncSession, q: str, skip: int = 0, limit: int = 10) -> List[Student]:
+    """Async equivalent of crud.student.search_students."""
+    query = build_match_query(q)
+    if query is None:
+        return []
+    statement = select(Student).from_statement(student_search_index.search_statement())
+    result = await db.execute(statement, {"query": query, "limit": limit, "skip": skip})
+    return list(result.scalars().all())
+
+async def update_student(student_id: int, student_update: Student, db: AsyncSession) -> Student:
+    """Async equivalent of crud.student.update_student."""
+    db_student = await get_student(student_id, db)
+
+    update_data = student_update.model_dump(exclude_unset=True)
+    if "grades" in update_data:
+        update_data.update(summarize_grades(update_data["grades"]))
+    for key, value in update_data.items():
+        setattr(db_student, key, value)
+    try:
+        if "name" in update_data or "email" in update_data:
+            await db.flush()
+            await sync_student_search(db, student_id)
+        await db.commit()
+        record_student_write(student_id)
+        etag = student_versions.row_etag(student_id)
+        await db.refresh(db_student)
+        cache_student_response(db_student, etag)
+        return db_student
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Email already exists")
+
+async def delete_student(student_id: int, db: AsyncSession) -> None:
+    """Async equivalent of crud.student.delete_student."""
+    student = await get_student(student_id, db)
+    await db.delete(student)
+    await db.flush()
+    await sync_student_search(db, student_id)
+    await db.commit()
+    record_student_write(student_id)
@@ -1,6 +1,12 @@
 from fastapi import FastAPI
 from .utils import create_db_and_tables, configure_cors, configure_logging_middleware
-from .routers import student_router, auth_router
+from .metrics import configure_metrics, metrics_registry
+from .query_stats import configure_query_stats
+from .profiling import configure_profiling
+from .auth import token_cache, password_pool
+from .crud.student import student_response_cache
+from .database_setup import engine, read_engine, async_engine
+from .routers import student_router, auth_router, analytics_router
 
 app = FastAPI(
     title="Student Management System",
@@ -10,10 +16,17 @@ app = FastAPI(
 
 configure_cors(app)
 configure_logging_middleware(app)
+configure_profiling(app)
+configure_metrics(app)
+metrics_registry.register_component("token_cache", token_cache.stats)
+metrics_registry.register_component("password_pool", password_pool.stats)
+metrics_registry.register_component("student_response_cache", student_response_cache.stats)
+configure_query_stats(app, engine, read_engine, async_engine)
 
 # Include routers
 app.include_router(student_router)
 app.include_router(auth_router)
+app.include_router(analytics_router)
 
 @app.on_event("startup")
 async def startup_event():
@@ -10,4 +10,9 @@ class Student(SQLModel, table=True):
     age: int
     email: EmailStr = Field(unique=True)
     grades: List[float] = Field(default_factory=list, sa_column=Column(JSON))
-
+    # Derived from grades by crud.student so threshold and top-K queries can
+    # use an index instead of decoding the JSON column.
+    grade_average: Optional[float] = Field(default=None, index=True)
+    grade_count: int = Field(default=0)
+    grade_min: Optional[float] = None
+    grade_max: Optional[float] = None
@@ -0,0 +1,183 @@
+import cProfile
+import os
+import pstats
+import random
+import re
+import secrets
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from typing import List, Optional
+from fastapi import FastAPI, Request
+from starlette.concurrency import run_in_threadpool
+from .metrics import resolve_route
+
+# Requests carrying "X-Profile: <PROFILE_TOKEN>" are profiled; unset disables the header
+PROFILE_TOKEN = os.getenv("PROFILE_TOKEN")
+# Fraction of all requests profiled without the header
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", 0.0))
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+# "collapsed" (stack sampler, flamegraph.pl / speedscope input) or "pstats" (cProfile)
+PROFILE_FORMAT = os.getenv("PROFILE_FORMAT", "collapsed")
+PROFILE_INTERVAL = float(os.getenv("PROFILE_INTERVAL", 0.001))
+
+
+class StackSampler:
+    """
+    Sampling profiler for every thread of the process.
+
+    A background thread reads all other threads' stacks every ``interval``
+    seconds, so the profiled code runs at full speed apart from the GIL
+    hand-offs. Stacks are aggregated in collapsed form (``a;b;c count``),
+    rooted at the thread name, so the event loop and the threadpool
+    workers (database calls, bcrypt, export streaming) show up side by side.
+    """
+
+    def __init__(self, interval: float = PROFILE_INTERVAL):
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self.samples[";".join(reversed(stack))] += 1
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+
+class ThreadsProfiler:
+    """
+    cProfile for the calling thread and the threads running alongside it.
+
+    cProfile only records the thread that enables it, so every other thread
+    gets its own profile, started by a hook on its first profiler event and
+    merged into one pstats file at the end. The hook reaches threads that
+    already exist only where ``threading.setprofile_all_threads`` is
+    available (Python 3.12+); before that it covers threads started while
+    profiling.
+    """
+
+    def __init__(self):
+        self.profiles: List[cProfile.Profile] = []
+        self._lock = threading.Lock()
+        self._main = cProfile.Profile()
+
+    def _hook(self, frame, event, arg) -> None:
+        # Replaced in this thread by its own cProfile on the first event
+        profile = cProfile.Profile()
+        with self._lock:
+            self.profiles.append(profile)
+        profile.enable()
+
+    def start(self) -> None:
+        threading.setprofile(self._hook)
+        if hasattr(threading, "setprofile_all_threads"):
+            threading.setprofile_all_threads(self._hook)
+        self._main.enable()
+
+    def stop(self) -> None:
+        self._main.disable()
+        threading.setprofile(None)
+        if hasattr(threading, "setprofile_all_threads"):
+            threading.setprofile_all_threads(None)
+
+    def stats(self) -> pstats.Stats:
+        with self._lock:
+            profiles = list(self.profiles)
+        return pstats.Stats(self._main, *profiles)
+
+
+def should_profile(request: Request) -> bool:
+    """True if the request asked for profiling with the right token, or was sampled."""
+    header = request.headers.get("x-profile")
+    if header and PROFILE_TOKEN and secrets.compare_digest(header, PROFILE_TOKEN):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+def profile_path(method: str, route: str, elapsed: float, extension: str) -> str:
+    """File name tagged with time, route and latency, e.g. ``..._GET_products_id_12.3ms.collapsed``."""
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+    stamp = datetime.now().strftime("%Y%m%dT%H%M%S%f")
+    return os.path.join(PROFILE_DIR, f"{stamp}_{method}_{slug}_{elapsed * 1000:.1f}ms.{extension}")
+
+
+def _write_collapsed(path: str, sampler: StackSampler) -> None:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    with open(path, "w") as f:
+        f.write(sampler.collapsed())
+
+
+def _write_pstats(path: str, profiler: ThreadsProfiler) -> None:
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    profiler.stats().dump_stats(path)
+
+
+def configure_profiling(app: FastAPI) -> None:
+    """
+    Profile selected requests and write the result to PROFILE_DIR.
+
+    A request is profiled when it sends ``X-Profile`` equal to PROFILE_TOKEN,
+    or at random with probability PROFILE_SAMPLE_RATE. One request is
+    profiled at a time; others arriving meanwhile run normally. The profile
+    covers the event loop and the threadpool workers, so work of concurrent
+    requests can show up in it. Profiled responses carry ``X-Profile-File``.
+    """
+    busy = threading.Lock()
+
+    @app.middleware("http")
+    async def profile_request(request: Request, call_next):
+        if not should_profile(request) or not busy.acquire(blocking=False):
+            return await call_next(request)
+        try:
+            route = resolve_route(app, request.scope)
+            profiler: Optional[ThreadsProfiler] = None
+            sampler: Optional[StackSampler] = None
+            if PROFILE_FORMAT == "pstats":
+                profiler = ThreadsProfiler()
+                profiler.start()
+            else:
+                sampler = StackSampler()
+                sampler.start()
+            start_time = time.perf_counter()
+            try:
+                response = await call_next(request)
+            finally:
+                elapsed = time.perf_counter() - start_time
+                if profiler is not None:
+                    profiler.stop()
+                else:
+                    sampler.stop()
+
+            if profiler is not None:
+                path = profile_path(request.method, route, elapsed, "prof")
+                await run_in_threadpool(_write_pstats, path, profiler)
+            else:
+                path = profile_path(request.method, route, elapsed, "collapsed")
+                await run_in_threadpool(_write_collapsed, path, sampler)
+            response.headers["X-Profile-File"] = os.path.basename(path)
+            return response
+        finally:
+            busy.release()
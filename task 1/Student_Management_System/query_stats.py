@@ -0,0 +1,132 @@
+import logging
+import os
+import time
+from collections import Counter
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+from typing import Dict, List, Optional, Union
+from fastapi import FastAPI, Request
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+SLOW_QUERY_THRESHOLD_MS = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", 100))
+SLOW_QUERY_LOG_FILE = os.getenv("SLOW_QUERY_LOG_FILE", "slow_queries.log")
+# The same statement running this many times in one request is reported as N+1
+N_PLUS_ONE_THRESHOLD = int(os.getenv("N_PLUS_ONE_THRESHOLD", 5))
+EXPLAINABLE = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+slow_query_logger = logging.getLogger(f"{__name__}.slow")
+logger = logging.getLogger(__name__)
+
+
+class RequestQueryStats:
+    """Queries executed while serving one request."""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int = N_PLUS_ONE_THRESHOLD) -> Dict[str, int]:
+        """Statements run at least ``threshold`` times: likely N+1 loops."""
+        return {statement: count for statement, count in self.statements.items() if count >= threshold}
+
+
+_current_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> Optional[RequestQueryStats]:
+    """Stats of the request being served, or None outside a request."""
+    return _current_stats.get()
+
+
+def _explain(conn, statement: str, parameters, executemany: bool) -> List[str]:
+    if not statement.lstrip().upper().startswith(EXPLAINABLE):
+        return []
+    if executemany:
+        parameters = parameters[0] if parameters else ()
+    cursor = conn.connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters or ())
+        return [row[-1] for row in cursor.fetchall()]
+    except Exception as exc:
+        return [f"<plan unavailable: {exc}>"]
+    finally:
+        cursor.close()
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Time every statement run on an engine.
+
+    Durations are added to the current request's RequestQueryStats; statements
+    slower than SLOW_QUERY_THRESHOLD_MS are logged with their query plan.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def start_timer(conn, cursor, statement, parameters, context, executemany):
+        # Kept on the execution context, which is dropped with the statement,
+        # so a statement that raises leaves nothing behind on the connection.
+        if context is not None:
+            context._query_start = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def stop_timer(conn, cursor, statement, parameters, context, executemany):
+        start = getattr(context, "_query_start", None)
+        if start is None:
+            return
+        elapsed = time.perf_counter() - start
+        stats = _current_stats.get()
+        if stats is not None:
+            stats.record(statement, elapsed)
+        if elapsed * 1000 >= SLOW_QUERY_THRESHOLD_MS:
+            slow_query_logger.warning(
+                "slow query (%.1f ms): %s\nplan:\n  %s",
+                elapsed * 1000, statement, "\n  ".join(_explain(conn, statement, parameters, executemany)),
+            )
+
+
+def configure_query_stats(app: FastAPI, *engines: Optional[Union[Engine, AsyncEngine]]) -> None:
+    """
+    Count queries and DB time per request.
+
+    The totals are stored on ``request.state.query_stats`` and returned in the
+    ``X-DB-Query-Count`` and ``X-DB-Time`` headers. Requests that repeat a
+    statement N_PLUS_ONE_THRESHOLD times or more get ``X-DB-N-Plus-One`` and
+    a warning in the log.
+
+    Args:
+        app: The FastAPI app.
+        engines: Engines to instrument; async engines are accepted and None is skipped.
+    """
+    for engine in engines:
+        if engine is not None:
+            instrument_engine(getattr(engine, "sync_engine", engine))
+    if not slow_query_logger.handlers:
+        handler = RotatingFileHandler(SLOW_QUERY_LOG_FILE, maxBytes=10 * 1024 * 1024, backupCount=3, delay=True)
+        handler.setFormatter(logging.Formatter("%(asctime)s - %(message)s"))
+        slow_query_logger.addHandler(handler)
+
+    @app.middleware("http")
+    async def collect_query_stats(request: Request, call_next):
+        stats = RequestQueryStats()
+        request.state.query_stats = stats
+        token = _current_stats.set(stats)
+        try:
+            response = await call_next(request)
+        finally:
+            _current_stats.reset(token)
+        response.headers["X-DB-Query-Count"] = str(stats.count)
+        response.headers["X-DB-Time"] = f"{stats.seconds * 1000:.2f}ms"
+        repeated = stats.repeated()
+        if repeated:
+            response.headers["X-DB-N-Plus-One"] = str(len(repeated))
+            for statement, count in repeated.items():
+                logger.warning("possible N+1 on %s %s: %d x %s", request.method, request.url.path, count, statement)
+        return response
@@ -0,0 +1,153 @@
+import json
+import logging
+import os
+import queue
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import List
+
+REQUEST_LOG_FILE = os.getenv("REQUEST_LOG_FILE", "requests.log")
+REQUEST_LOG_MAX_BYTES = int(os.getenv("REQUEST_LOG_MAX_BYTES", 10 * 1024 * 1024))
+REQUEST_LOG_BACKUP_COUNT = int(os.getenv("REQUEST_LOG_BACKUP_COUNT", 5))
+REQUEST_LOG_BATCH_SIZE = int(os.getenv("REQUEST_LOG_BATCH_SIZE", 256))
+REQUEST_LOG_FLUSH_INTERVAL = float(os.getenv("REQUEST_LOG_FLUSH_INTERVAL", 1.0))
+# Fraction of 2xx responses that are logged; errors are always logged
+REQUEST_LOG_SAMPLE_RATE = float(os.getenv("REQUEST_LOG_SAMPLE_RATE", 1.0))
+REQUEST_LOG_CONSOLE = os.getenv("REQUEST_LOG_CONSOLE", "1") == "1"
+
+# Attributes passed through ``extra=`` that end up in the JSON record
+STRUCTURED_FIELDS = ("method", "path", "query", "status", "duration_ms", "client")
+
+
+class JsonFormatter(logging.Formatter):
+    """Format a record as a single-line JSON object."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for field in STRUCTURED_FIELDS:
+            if hasattr(record, field):
+                entry[field] = getattr(record, field)
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, separators=(",", ":"))
+
+
+class BatchingRotatingFileHandler(RotatingFileHandler):
+    """
+    Size-rotated file handler that writes records in batches.
+
+    Formatted lines are buffered and written with a single write() once
+    ``batch_size`` records are pending or ``flush_interval`` seconds passed.
+    Rotation is checked per batch.
+    """
+
+    def __init__(self, filename: str, max_bytes: int, backup_count: int,
+                 batch_size: int = 256, flush_interval: float = 1.0):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            self._buffer.append(self.format(record) + self.terminator)
+        except Exception:
+            self.handleError(record)
+            return
+        if len(self._buffer) >= self.batch_size or time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        self.acquire()
+        try:
+            if self._buffer:
+                data = "".join(self._buffer)
+                self._buffer.clear()
+                if self.stream is None:
+                    self.stream = self._open()
+                if self.maxBytes > 0 and 0 < self.stream.tell() and self.stream.tell() + len(data) >= self.maxBytes:
+                    self.doRollover()
+                    if self.stream is None:
+                        self.stream = self._open()
+                self.stream.write(data)
+            self._last_flush = time.monotonic()
+            super().flush()
+        finally:
+            self.release()
+
+    def close(self) -> None:
+        self.flush()
+        super().close()
+
+
+class FlushingQueueListener(QueueListener):
+    """QueueListener that flushes its handlers whenever the queue goes idle."""
+
+    def __init__(self, log_queue, *handlers, flush_interval: float = 1.0):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.flush_interval = flush_interval
+
+    def dequeue(self, block: bool):
+        if not block:
+            return self.queue.get_nowait()
+        while True:
+            try:
+                return self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self.flush()
+
+    def flush(self) -> None:
+        for handler in self.handlers:
+            handler.flush()
+
+    def stop(self) -> None:
+        """Drain the queue, stop the thread and write out buffered records."""
+        super().stop()
+        self.flush()
+
+
+def create_request_logger(name: str) -> logging.Logger:
+    """
+    Build a logger whose records are handed to a background thread.
+
+    The calling code only puts records on an in-memory queue; formatting and
+    disk writes happen on the listener thread. The listener is started here
+    and must be stopped (see QueueListener.stop) to drain it on shutdown.
+
+    Returns:
+        The configured logger, with the listener attached as ``logger.listener``.
+    """
+    handlers: List[logging.Handler] = [
+        BatchingRotatingFileHandler(
+            REQUEST_LOG_FILE,
+            max_bytes=REQUEST_LOG_MAX_BYTES,
+            backup_count=REQUEST_LOG_BACKUP_COUNT,
+            batch_size=REQUEST_LOG_BATCH_SIZE,
+            flush_interval=REQUEST_LOG_FLUSH_INTERVAL,
+        )
+    ]
+    handlers[0].setFormatter(JsonFormatter())
+    if REQUEST_LOG_CONSOLE:
+        console = logging.StreamHandler()
+        console.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
+        handlers.append(console)
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger = logging.getLogger(name)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+    logger.addHandler(QueueHandler(log_queue))
+
+    listener = FlushingQueueListener(log_queue, *handlers, flush_interval=REQUEST_LOG_FLUSH_INTERVAL)
+    listener.start()
+    logger.listener = listener
+    return logger
@@ -0,0 +1,81 @@
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class ResponseCache:
+    """
+    Bounded LRU cache of serialized response bodies keyed by row ID.
+
+    Each entry remembers the ETag it was built for; get() only returns it
+    while that ETag is still current, so a body read just before a write can
+    never be served after it.
+    """
+
+    def __init__(self, maxsize: int = 10_000):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[int, Tuple[str, bytes]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: int, etag: str) -> Optional[bytes]:
+        """
+        Return the cached body for a row.
+
+        Args:
+            key: Row ID.
+            etag: Current ETag of the row.
+
+        Returns:
+            The serialized body, or None on a miss or an outdated entry.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != etag:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: int, etag: str, body: bytes) -> None:
+        """
+        Cache a serialized body.
+
+        Args:
+            key: Row ID.
+            etag: ETag taken before the row was read.
+            body: Serialized response body.
+        """
+        with self._lock:
+            self._entries[key] = (etag, body)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *keys: int) -> None:
+        """Drop the entries of the given rows."""
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
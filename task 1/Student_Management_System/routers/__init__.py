@@ -1,7 +1,9 @@
 from .student import router as student_router
 from .auth import router as auth_router
+from .analytics import router as analytics_router
 
 __all__ = [
     "student_router",
-    "auth_router"
+    "auth_router",
+    "analytics_router"
 ]
@@ -0,0 +1,24 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from ..utils import get_read_session
+from ..analytics import get_cohort_summary, get_student_grade_stats
+from ..schemas import CohortSummary, StudentGradeStats
+
+router = APIRouter(prefix="/analytics", tags=["analytics"])
+
+@router.get("/grades", response_model=CohortSummary)
+async def cohort_summary_endpoint(
+        min_age: Optional[int] = None,
+        max_age: Optional[int] = None,
+        bins: int = Query(10, gt=0, le=100),
+        db: Session = Depends(get_read_session)
+):
+    """Grade statistics for all students, optionally limited to an age range"""
+    return get_cohort_summary(db, min_age=min_age, max_age=max_age, bins=bins)
+
+@router.get("/grades/{student_id}", response_model=StudentGradeStats)
+async def student_grade_stats_endpoint(student_id: int, db: Session = Depends(get_read_session)):
+    """Grade statistics for a single student"""
+    return get_student_grade_stats(student_id, db)
@@ -7,6 +7,7 @@ from ..auth import (
     get_current_user,
     authenticate_user,
     verify_password,
+    password_pool,
 )
 from ..models.user import User
 from ..schemas.auth import Token
@@ -15,6 +16,6 @@ router = APIRouter()
 
 @router.post("/token", response_model=Token)
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
-    user = authenticate_user(form_data.username, form_data.password)
+    user = await password_pool.run(authenticate_user, form_data.username, form_data.password)
     access_token = create_access_token(data={"sub": user.username})
     return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
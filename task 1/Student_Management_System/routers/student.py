@@ -1,17 +1,43 @@
-from typing import List
-from fastapi import APIRouter, Depends, status
+from typing import List, Optional, Tuple
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ..auth import get_current_user
-from ..utils import get_session
+from ..pagination import encode_cursor, decode_cursor
+from ..utils import get_session, get_read_session, get_db_session, get_db_read_session, ReadSessionLocal
+from ..export import stream_export, EXPORT_MEDIA_TYPES
+from ..bulk_import import import_students
+from ..etag import etag_matches, not_modified
+from ..crud import student_async
 from ..crud.student import (
     create_student,
     get_student, 
     get_students,
+    get_top_students,
+    search_students,
+    iter_students_for_export,
+    STUDENT_EXPORT_COLUMNS,
+    cache_student_response,
+    student_response_cache,
+    student_versions,
     update_student,
-    delete_student
+    update_students_bulk,
+    delete_student,
+    delete_students_bulk
+)
+from ..schemas import (
+    StudentCreate,
+    StudentUpdate,
+    StudentResponse,
+    StudentRanking,
+    StudentImportResult,
+    StudentBatchUpdate,
+    StudentBatchDelete,
+    BatchItemResult,
+    StudentBatchResult,
 )
-from ..schemas import StudentCreate, StudentUpdate, StudentResponse
 from ..models import Student, User
 
 router = APIRouter(prefix="/students", tags=["students"])
@@ -19,47 +45,191 @@ router = APIRouter(prefix="/students", tags=["students"])
 @router.post("/", response_model=StudentResponse, status_code=status.HTTP_201_CREATED)
 async def create_student_endpoint(
         student: StudentCreate,
-        db: Session = Depends(get_session),
+        db: Session = Depends(get_db_session),
         current_user: User = Depends(get_current_user)
 ):
     """Create a new student"""
     # Convert Pydantic model to SQLModel
     db_student = Student(**student.model_dump())
+    if isinstance(db, AsyncSession):
+        return await student_async.create_student(db_student, db)
     return create_student(db_student, db)
 
+@router.post("/import", response_model=StudentImportResult)
+async def import_students_endpoint(
+        request: Request,
+        batch_size: int = Query(1000, gt=0, le=5000),
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Bulk import students from a streamed NDJSON or CSV body.
+
+    Send ``Content-Type: text/csv`` for CSV (header ``name,age,email,grades``,
+    grades ``;``-separated); anything else is read as NDJSON.
+    """
+    fmt = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+    return await import_students(request.stream(), fmt, batch_size, db)
+
+def _batch_result(ids: List[int], errors: List[Optional[Tuple[int, str]]]) -> StudentBatchResult:
+    results = [
+        BatchItemResult(id=item_id, status=status.HTTP_200_OK) if error is None
+        else BatchItemResult(id=item_id, status=error[0], detail=error[1])
+        for item_id, error in zip(ids, errors)
+    ]
+    failed = sum(error is not None for error in errors)
+    return StudentBatchResult(succeeded=len(errors) - failed, failed=failed, results=results)
+
+@router.patch("/batch", response_model=StudentBatchResult)
+async def batch_update_students_endpoint(
+        batch: StudentBatchUpdate,
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Apply partial updates to many students in one transaction.
+
+    Each item carries the student ``id`` and the fields to change. Items that
+    fail (unknown id, duplicate email) are reported without aborting the rest.
+    """
+    items = [item.model_dump(exclude_unset=True) for item in batch.items]
+    errors = update_students_bulk(items, db)
+    return _batch_result([item["id"] for item in items], errors)
+
+@router.delete("/batch", response_model=StudentBatchResult)
+async def batch_delete_students_endpoint(
+        batch: StudentBatchDelete,
+        db: Session = Depends(get_session),
+        current_user: User = Depends(get_current_user)
+):
+    """Delete many students in one transaction, with a result per id."""
+    errors = delete_students_bulk(batch.ids, db)
+    return _batch_result(batch.ids, errors)
+
+@router.get("/export")
+async def export_students_endpoint(fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$")):
+    """Stream every student as NDJSON or CSV."""
+    def rows():
+        # The response body is produced after this handler returns, so the
+        # stream owns its session instead of borrowing the request's one.
+        with ReadSessionLocal() as db:
+            yield from iter_students_for_export(db)
+
+    return StreamingResponse(
+        stream_export(rows(), STUDENT_EXPORT_COLUMNS, fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="students.{fmt}"'},
+    )
+
+@router.get("/search", response_model=List[StudentResponse])
+async def search_students_endpoint(
+        q: str = Query(..., min_length=1, max_length=200),
+        skip: int = Query(0, ge=0),
+        limit: int = Query(10, gt=0, le=100),
+        db: Session = Depends(get_db_read_session)
+):
+    """
+    Full-text search over student names and emails.
+
+    Each word of ``q`` matches as a prefix; results are ranked by relevance.
+    """
+    if isinstance(db, AsyncSession):
+        return await student_async.search_students(db, q, skip=skip, limit=limit)
+    return search_students(db, q, skip=skip, limit=limit)
+
+@router.get("/leaderboard", response_model=List[StudentRanking])
+async def leaderboard_endpoint(
+        request: Request,
+        response: Response,
+        limit: int = Query(50, gt=0, le=1000),
+        db: Session = Depends(get_read_session)
+):
+    """Get the students with the highest grade average"""
+    etag = student_versions.collection_etag()
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    return get_top_students(db, limit=limit)
+
 @router.get("/{student_id}", response_model=StudentResponse)
-async def get_student_endpoint(student_id: int, db: Session = Depends(get_session)):
-    """Get a student by ID"""
-    return get_student(student_id, db)
+async def get_student_endpoint(
+        student_id: int,
+        request: Request,
+        db: Session = Depends(get_db_read_session)
+):
+    """
+    Get a student by ID.
+
+    Answers 304 without touching the database when ``If-None-Match`` holds
+    the current ETag, and serves hot students from the response cache.
+    """
+    # Take the tag before reading: a write racing with the read can only
+    # make the tag older than the body, never newer.
+    etag = student_versions.row_etag(student_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    body = student_response_cache.get(student_id, etag)
+    if body is None:
+        if isinstance(db, AsyncSession):
+            student = await student_async.get_student(student_id, db)
+        else:
+            student = get_student(student_id, db)
+        body = cache_student_response(student, etag)
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
 
 @router.get("/", response_model=List[StudentResponse])
 async def get_students_endpoint(
+    request: Request,
+    response: Response,
     skip: int = 0, 
     limit: int = 10, 
-    db: Session = Depends(get_session)
+    after: Optional[str] = None,
+    min_average: Optional[float] = None,
+    db: Session = Depends(get_db_read_session)
 ):
-    """Get all students with pagination"""
-    return get_students(db, skip=skip, limit=limit)
+    """
+    Get all students with pagination.
+
+    Full pages carry an ``X-Next-Cursor`` header; pass it back as ``after``
+    to fetch the next page with a keyset scan instead of an offset.
+    """
+    etag = student_versions.collection_etag()
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    after_id = decode_cursor(after) if after else None
+    if isinstance(db, AsyncSession):
+        students = await student_async.get_students(db, skip=skip, limit=limit, after_id=after_id, min_average=min_average)
+    else:
+        students = get_students(db, skip=skip, limit=limit, after_id=after_id, min_average=min_average)
+    if students and len(students) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(students[-1].id)
+    return students
 
 @router.put("/{student_id}", response_model=StudentResponse)
 async def update_student_endpoint(
     student_id: int, 
     student_update: StudentUpdate, 
-    db: Session = Depends(get_session),
+    db: Session = Depends(get_db_session),
     current_user: User = Depends(get_current_user)
 ):
     """Update a student"""
     # Convert Pydantic model to SQLModel, excluding unset fields
     db_student = Student(**student_update.model_dump(exclude_unset=True))
+    if isinstance(db, AsyncSession):
+        return await student_async.update_student(student_id, db_student, db)
     return update_student(student_id, db_student, db)
 
 @router.delete("/{student_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_student_endpoint(
         student_id: int,
-        db: Session = Depends(get_session),
+        db: Session = Depends(get_db_session),
         current_user: User = Depends(get_current_user)
 ):
     """Delete a student"""
-    delete_student(student_id, db)
+    if isinstance(db, AsyncSession):
+        await student_async.delete_student(student_id, db)
+    else:
+        delete_student(student_id, db)
     return None
 
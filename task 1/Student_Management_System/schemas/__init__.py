@@ -1,12 +1,38 @@
-from .student import StudentCreate, StudentUpdate, StudentResponse
+from .student import (
+    StudentCreate,
+    StudentUpdate,
+    StudentResponse,
+    StudentRanking,
+    ImportRowError,
+    StudentImportResult,
+    StudentBatchUpdateItem,
+    StudentBatchUpdate,
+    StudentBatchDelete,
+    BatchItemResult,
+    StudentBatchResult,
+)
 from .auth import UserResponse, UserLogin, Token, TokenData
+from .analytics import GradeStats, HistogramBin, AgeBucket, StudentGradeStats, CohortSummary
 
 __all__ = [
     "StudentCreate",
     "StudentUpdate", 
     "StudentResponse",
+    "StudentRanking",
+    "ImportRowError",
+    "StudentImportResult",
+    "StudentBatchUpdateItem",
+    "StudentBatchUpdate",
+    "StudentBatchDelete",
+    "BatchItemResult",
+    "StudentBatchResult",
     "UserLogin",
     "UserResponse",
     "TokenData",
-    "Token"
+    "Token",
+    "GradeStats",
+    "HistogramBin",
+    "AgeBucket",
+    "StudentGradeStats",
+    "CohortSummary"
 ]
@@ -0,0 +1,34 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+
+
+class GradeStats(BaseModel):
+    count: int
+    mean: Optional[float] = None
+    median: Optional[float] = None
+    std: Optional[float] = None
+    min: Optional[float] = None
+    max: Optional[float] = None
+    percentiles: Dict[str, float] = {}
+
+class HistogramBin(BaseModel):
+    lower: float
+    upper: float
+    count: int
+
+class AgeBucket(BaseModel):
+    age: int
+    students: int
+    mean: float
+
+class StudentGradeStats(BaseModel):
+    student_id: int
+    grades: GradeStats
+
+class CohortSummary(BaseModel):
+    students: int
+    students_with_grades: int
+    grades: GradeStats
+    student_means: GradeStats
+    histogram: List[HistogramBin]
+    by_age: List[AgeBucket]
@@ -1,6 +1,8 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from typing import Optional, List
 
+MAX_BATCH_ITEMS = 5000
+
 
 class StudentCreate(BaseModel):
     name: str
@@ -14,9 +16,48 @@ class StudentUpdate(BaseModel):
     email: Optional[EmailStr] = None
     grades: Optional[List[float]] = None
 
+class StudentBatchUpdateItem(StudentUpdate):
+    id: int
+
+class StudentBatchUpdate(BaseModel):
+    items: List[StudentBatchUpdateItem] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+
+class StudentBatchDelete(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BATCH_ITEMS)
+
+class BatchItemResult(BaseModel):
+    id: int
+    status: int
+    detail: Optional[str] = None
+
+class StudentBatchResult(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BatchItemResult]
+
 class StudentResponse(BaseModel):
     id: int
     name: str
     age: int
     email: EmailStr
-    grades: List[float]
\ No newline at end of file
+    grades: List[float]
+
+class StudentRanking(BaseModel):
+    id: int
+    name: str
+    email: EmailStr
+    grade_average: float
+    grade_count: int
+    grade_min: float
+    grade_max: float
+
+class ImportRowError(BaseModel):
+    line: int
+    error: str
+
+class StudentImportResult(BaseModel):
+    inserted: int
+    failed: int
+    errors: List[ImportRowError]
+    elapsed_seconds: float
+    rows_per_second: float
@@ -1,27 +1,63 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from fastapi import FastAPI, Request
+from sqlalchemy import inspect, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import sessionmaker, Session
 from sqlmodel import SQLModel
-import logging
+import random
 import time
-from .database_setup import engine
+from .database_setup import engine, read_engine, async_engine, DB_MODE
 from fastapi.middleware.cors import CORSMiddleware
+from .request_logging import REQUEST_LOG_SAMPLE_RATE, create_request_logger
+from .crud.student import student_search_index
 
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-    logging.FileHandler('requests.log'),
-    logging.StreamHandler()
-    ]
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+AsyncSessionLocal = (
+    async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    if async_engine is not None else None
 )
 
 
+GRADE_SUMMARY_COLUMNS = {
+    "grade_average": "FLOAT",
+    "grade_count": "INTEGER NOT NULL DEFAULT 0",
+    "grade_min": "FLOAT",
+    "grade_max": "FLOAT",
+}
+
+
 def create_db_and_tables():
     """Create all database tables"""
     SQLModel.metadata.create_all(bind=engine)
+    add_grade_summary_columns()
+    with engine.begin() as connection:
+        student_search_index.create(connection)
+
+
+def add_grade_summary_columns() -> None:
+    """
+    Add and backfill the derived grade columns on a students.db created
+    before they existed. create_all() does not alter existing tables.
+    """
+    existing = {column["name"] for column in inspect(engine).get_columns("student")}
+    missing = [name for name in GRADE_SUMMARY_COLUMNS if name not in existing]
+    if not missing:
+        return
+    with engine.begin() as connection:
+        for name in missing:
+            connection.execute(text(f"ALTER TABLE student ADD COLUMN {name} {GRADE_SUMMARY_COLUMNS[name]}"))
+        connection.execute(text(
+            "CREATE INDEX IF NOT EXISTS ix_student_grade_average ON student (grade_average)"
+        ))
+        connection.execute(text(
+            "UPDATE student SET "
+            "grade_average = (SELECT avg(value) FROM json_each(student.grades)), "
+            "grade_count = (SELECT count(*) FROM json_each(student.grades)), "
+            "grade_min = (SELECT min(value) FROM json_each(student.grades)), "
+            "grade_max = (SELECT max(value) FROM json_each(student.grades))"
+        ))
 
 
 def get_session() -> Generator[Session, None, None]:
@@ -35,6 +71,29 @@ def get_session() -> Generator[Session, None, None]:
     finally:
         session.close()
 
+def get_read_session() -> Generator[Session, None, None]:
+    """
+    Dependency function to get a session on the read-only connection pool.
+    Use it for GET routes so reads don't compete with writers for connections.
+    """
+    session = ReadSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function to get an async database session (DB_MODE=async).
+    """
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+# Session dependency for the CRUD endpoints, chosen by DB_MODE
+get_db_session = get_async_session if DB_MODE == "async" else get_session
+get_db_read_session = get_async_session if DB_MODE == "async" else get_read_session
+
 def configure_cors(app: FastAPI) -> None:
     """Configure CORS middleware for the FastAPI app."""
     app.add_middleware(
@@ -43,18 +102,38 @@ def configure_cors(app: FastAPI) -> None:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "X-DB-Query-Count", "X-DB-Time", "X-DB-N-Plus-One"],
     )
 
 def configure_logging_middleware(app: FastAPI) -> None:
-    logger = logging.getLogger(__name__)
+    """
+    Log every request as a structured JSON record.
+
+    Records go through an in-memory queue to a background listener that
+    batches the file writes, so handlers never wait on disk I/O. Only
+    REQUEST_LOG_SAMPLE_RATE of the 2xx responses are logged; every other
+    status is always logged.
+    """
+    logger = create_request_logger(__name__)
+    app.add_event_handler("shutdown", logger.listener.stop)
 
     @app.middleware("http")
     async def log_requests(request: Request, call_next):
-        start_time = time.time()
+        start_time = time.perf_counter()
         response = await call_next(request)
-        process_time = time.time() - start_time
-        logger.info(f"Request {request.method} {request.url} {response.status_code} took {process_time:.2f} seconds")
+        process_time = time.perf_counter() - start_time
+        status = response.status_code
+        if 200 <= status < 300 and REQUEST_LOG_SAMPLE_RATE < 1.0 and random.random() >= REQUEST_LOG_SAMPLE_RATE:
+            return response
+        logger.info(
+            "%s %s %s %.2fms", request.method, request.url.path, status, process_time * 1000,
+            extra={
+                "method": request.method,
+                "path": request.url.path,
+                "query": request.url.query,
+                "status": status,
+                "duration_ms": round(process_time * 1000, 3),
+                "client": request.client.host if request.client else None,
+            },
+        )
         return response
-
-
-
@@ -2,8 +2,11 @@ from datetime import datetime, timedelta
 from typing import Optional, List
 from fastapi import HTTPException, Depends
 from jose import jwt, JWTError
+from sqlalchemy import event, inspect
 from sqlalchemy.orm import Session
 from .models.user import User
+from .password_pool import PasswordPool
+from .token_cache import TokenCache
 from .utils import get_session
 from fastapi.security import OAuth2PasswordBearer
 from passlib.context import CryptContext
@@ -14,6 +17,10 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/token")
 SECRET_KEY = "your-secret-key-here"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
+PASSWORD_HASH_WORKERS = 4
+PASSWORD_HASH_QUEUE_LIMIT = 64
+token_cache = TokenCache()
+password_pool = PasswordPool(max_workers=PASSWORD_HASH_WORKERS, max_pending=PASSWORD_HASH_QUEUE_LIMIT)
 
 
 def hash_password(password: str) -> str:
@@ -88,6 +95,10 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
     Raises:
         HTTPException: If token is invalid or user not found.
     """
+    cached_user = token_cache.get(token)
+    if cached_user is not None:
+        return cached_user
+
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         username: str = payload.get("sub")
@@ -101,8 +112,22 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
         raise HTTPException(status_code=404, detail="User not found")
     if not user.is_active:
         raise HTTPException(status_code=403, detail="Inactive user.")
+    expires_at = payload.get("exp")
+    if expires_at is not None:
+        # Detach the user so later commits in this session don't expire the
+        # cached instance shared with other requests.
+        db.expunge(user)
+        token_cache.put(token, user, user.username, expires_at)
     return user
 
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def invalidate_cached_tokens(mapper, connection, target: User) -> None:
+    """Drop cached tokens when a user is changed (e.g. deactivated) or deleted."""
+    usernames = {target.username, *inspect(target).attrs.username.history.deleted}
+    for username in usernames:
+        token_cache.invalidate_user(username)
+
 def get_current_admin_user(current_user: User = Depends(get_current_user)) -> User:
     """Dependency to ensure current user is admin"""
     if not current_user.is_admin:
@@ -0,0 +1,156 @@
+import asyncio
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, NamedTuple, Optional, Tuple
+from pydantic import TypeAdapter
+from .pagination import encode_cursor
+from .schemas.product import ProductResponse
+
+CATALOG_CACHE_SIZE = 1024
+# Upper bound on the rendered bytes held, whatever the page count
+CATALOG_CACHE_MAX_BYTES = 32 * 1024 * 1024
+
+_page_adapter = TypeAdapter(List[ProductResponse])
+
+
+class CatalogPage(NamedTuple):
+    body: bytes
+    next_cursor: Optional[str]
+
+
+def render_catalog_page(products: list, limit: int) -> CatalogPage:
+    """
+    Serialize a page of products as the ``GET /products/`` JSON body.
+
+    Args:
+        products: Product rows of the page.
+        limit: Requested page size; full pages get a next cursor.
+
+    Returns:
+        The body and the ``X-Next-Cursor`` value (None on the last page).
+    """
+    body = _page_adapter.dump_json(_page_adapter.validate_python(products))
+    next_cursor = encode_cursor(products[-1].id) if products and len(products) == limit else None
+    return CatalogPage(body, next_cursor)
+
+
+class CatalogPageCache:
+    """
+    LRU cache of rendered catalog pages keyed by their query parameters.
+
+    Every entry remembers the catalog ETag it was rendered under and is only
+    served while that ETag is current; product writes also clear the cache.
+    Pages are evicted once there are more than ``maxsize`` of them or their
+    bodies add up to more than ``max_bytes``.
+    Concurrent misses for the same page share a single load.
+    """
+
+    def __init__(self, maxsize: int = CATALOG_CACHE_SIZE, max_bytes: int = CATALOG_CACHE_MAX_BYTES):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._entries: "OrderedDict[Hashable, Tuple[str, CatalogPage]]" = OrderedDict()
+        self._loading: Dict[Tuple[Hashable, str], asyncio.Future] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable, etag: str) -> Optional[CatalogPage]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != etag:
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Hashable, etag: str, page: CatalogPage) -> None:
+        with self._lock:
+            replaced = self._entries.pop(key, None)
+            if replaced is not None:
+                self.bytes -= len(replaced[1].body)
+            self._entries[key] = (etag, page)
+            self.bytes += len(page.body)
+            while len(self._entries) > self.maxsize or (self.bytes > self.max_bytes and len(self._entries) > 1):
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self.bytes -= len(evicted.body)
+                self.evictions += 1
+
+    async def get_or_load(
+            self,
+            key: Hashable,
+            etag: str,
+            load: Callable[[], Awaitable[CatalogPage]]
+    ) -> CatalogPage:
+        """
+        Return a cached page, loading it on a miss.
+
+        Args:
+            key: Page parameters.
+            etag: Catalog ETag taken before any read.
+            load: Coroutine function that reads and renders the page.
+
+        Returns:
+            The rendered page.
+        """
+        while True:
+            page = self.get(key, etag)
+            if page is not None:
+                return page
+            pending = self._loading.get((key, etag))
+            if pending is None:
+                break
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                if not pending.cancelled():
+                    raise
+                # The loading request was cancelled, not this one: try again.
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._loading[(key, etag)] = future
+        try:
+            page = await load()
+        except asyncio.CancelledError:
+            # load() runs on this request's session, so nobody can finish it;
+            # wake the waiters to load the page themselves.
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Waiters re-raise it; mark it retrieved in case there are none.
+            future.exception()
+            raise
+        finally:
+            del self._loading[(key, etag)]
+        self.put(key, etag, page)
+        future.set_result(page)
+        return page
+
+    def invalidate(self) -> None:
+        """Drop every page."""
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current size."""
+        with self._lock:
+            lookups = self.hits + self.misses + self.coalesced
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "bytes": self.bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+catalog_cache = CatalogPageCache()
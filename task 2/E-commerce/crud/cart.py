@@ -1,106 +1,169 @@
-import json
-import os
-from typing import List
+from typing import Dict, Iterable, List
 from fastapi import HTTPException
+from sqlalchemy import insert, select
 from sqlalchemy.exc import IntegrityError
 from ..models.cart import Cart
 from sqlalchemy.orm import Session
 from ..models.product import Product
-from ..crud.product import get_product
-
-# Resolve orders.json path anchored to the Task 2 directory
-ORDERS_FILE = os.path.normpath(os.path.join(os.path.dirname(os.path.dirname(__file__)), "..", "orders.json"))
+from ..crud.product import (
+    get_product,
+    record_product_write,
+    hot_stock,
+    reserve_stock,
+    reserve_stock_bulk,
+    release_stock,
+    undo_stock_reservation,
+)
 
 def create_cart(cart: Cart, db: Session) -> Cart:
-    """Create a new cart item in the database with stock validation and deduction."""
-     # Get the product to check stock
+    """
+    Create a new cart item (or grow an existing one) and reserve its stock.
+
+    The reservation is a conditional UPDATE, so concurrent requests cannot
+    oversell; its outcome decides whether the item is added.
+    """
+    # Get the product for its price (and a 404 if it does not exist)
     product = get_product(cart.product_id, db)
 
-    # check if enough stock is available
-    if product.stock < cart.quantity:
+    if not reserve_stock(product.id, cart.quantity, db):
+        db.rollback()
         raise HTTPException(
             status_code=400,
             detail=f"insufficient stock. Available: {product.stock}, "
                    f"Requested: {cart.quantity}")
 
-    # Check if user already has the product in cart
-    existing_cart_item = db.query(Cart).filter(
-        Cart.user_id == cart.user_id,
-        Cart.product_id == cart.product_id
-    ).first()
+    # Past this point every failure before the commit must give the units back
+    error_detail = "Error adding item to cart"
+    try:
+        # Check if user already has the product in cart
+        existing_cart_item = db.query(Cart).filter(
+            Cart.user_id == cart.user_id,
+            Cart.product_id == cart.product_id
+        ).first()
+
+        if existing_cart_item:
+            # update existing cart item
+            new_total_quantity = existing_cart_item.quantity + cart.quantity
+            existing_cart_item.quantity = new_total_quantity
+            existing_cart_item.total_price = product.price * new_total_quantity
+            item = existing_cart_item
+            error_detail = "Error updating cart"
+        else:
+            db.add(cart)
+            item = cart
+        db.commit()
+    except Exception as exc:
+        # e.g. "database is locked": the reservation must not leak
+        db.rollback()
+        undo_stock_reservation(product.id, cart.quantity)
+        if isinstance(exc, IntegrityError):
+            raise HTTPException(status_code=400, detail=error_detail)
+        raise
+    # The units now belong to a committed cart row and are never undone.
+    record_product_write(product.id)
+    db.refresh(item)
+    return item
+
+
+def merge_cart_items(items: Iterable[Dict[str, int]]) -> Dict[int, int]:
+    """Sum the requested quantities per product, keeping first-seen order."""
+    quantities: Dict[int, int] = {}
+    for item in items:
+        quantities[item["product_id"]] = quantities.get(item["product_id"], 0) + item["quantity"]
+    return quantities
+
+
+def check_batch_stock(quantities: Dict[int, int], products: Dict[int, Product]) -> None:
+    """
+    Validate a whole batch before reserving anything.
+
+    Raises:
+        HTTPException: 404 listing unknown products, or 400 listing every
+            product without enough stock.
+    """
+    missing = [product_id for product_id in quantities if product_id not in products]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Products not found: {missing}")
+    # Hot products keep part of their stock in memory; reserve_stock_bulk decides for them.
+    short = [
+        f"{product_id} (available {products[product_id].stock}, requested {quantity})"
+        for product_id, quantity in quantities.items()
+        if product_id not in hot_stock and products[product_id].stock < quantity
+    ]
+    if short:
+        raise HTTPException(status_code=400, detail=f"insufficient stock for products: {', '.join(short)}")
+
+
+def stage_cart_items(
+        user_id: int,
+        quantities: Dict[int, int],
+        products: Dict[int, Product],
+        existing: Dict[int, Cart]
+) -> List[Dict]:
+    """
+    Grow the user's existing cart rows in place and return rows to insert
+    for the other products (inserted with one executemany by the caller).
+    """
+    new_rows = []
+    for product_id, quantity in quantities.items():
+        price = products[product_id].price
+        cart_item = existing.get(product_id)
+        if cart_item is not None:
+            cart_item.quantity += quantity
+            cart_item.total_price = price * cart_item.quantity
+        else:
+            new_rows.append({"user_id": user_id, "product_id": product_id,
+                             "quantity": quantity, "total_price": price * quantity})
+    return new_rows
+
+
+def create_carts_bulk(user_id: int, items: List[Dict[str, int]], db: Session) -> List[Cart]:
+    """
+    Add several products to a user's cart in one transaction.
+
+    Loads every product with one IN query and the user's matching cart rows
+    with another, validates stock for the whole batch, reserves it with one
+    conditional UPDATE and commits once. Either every item is added or none.
+
+    Args:
+        user_id: Owner of the cart.
+        items: Dicts with product_id and quantity; repeated products are summed.
+        db: Database session.
+
+    Returns:
+        The cart rows of the requested products, in request order.
+
+    Raises:
+        HTTPException: 404 for unknown products, 400 for insufficient stock.
+    """
+    quantities = merge_cart_items(items)
+    product_ids = list(quantities)
+    products = {product.id: product for product in
+                db.execute(select(Product).where(Product.id.in_(product_ids))).scalars()}
+    check_batch_stock(quantities, products)
+
+    if not reserve_stock_bulk(quantities, db):
+        # Another request took the stock after the check above
+        db.rollback()
+        raise HTTPException(status_code=400, detail="insufficient stock for one or more products")
 
-    if existing_cart_item:
-        # update existing cart item
-        new_total_quantity = existing_cart_item.quantity + cart.quantity
-
-        # check if total quantity exceeds stock
-        if product.stock < new_total_quantity:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Insufficient stock. Available: {product.stock}, Total requested: {new_total_quantity}"
-            )
-
-        # update existing cart item
-        existing_cart_item.quantity = new_total_quantity
-        existing_cart_item.total_price = product.price * new_total_quantity
-
-        # reduce stock
-        product.stock -= cart.quantity
-
-        try:
-            db.commit()
-            db.refresh(existing_cart_item)
-            db.refresh(product)
-            return existing_cart_item
-        except IntegrityError:
-            db.rollback()
-            raise HTTPException(status_code=400, detail="Error updating cart")
-
-    else:
-        # create new cart existing_cart_item
-        # reduce stock
-        product.stock -= cart.quantity
-
-        db.add(cart)
-        try:
-            db.commit()
-            db.refresh(cart)
-            db.refresh(product)
-            return cart
-        except IntegrityError:
-            db.rollback()
-            raise HTTPException(
-                status_code=400,
-                detail="Error adding item to cart"
-            )
-
-
-def get_user_cart(user_id: int, db: Session) -> List[Cart]:
-    """Get all cart items for a user"""
-    return db.query(Cart).filter(Cart.user_id == user_id).all()
-
-def clear_user_cart(user_id: int, db: Session) -> None:
-    """Clear all items from user's cart"""
-    db.query(Cart).filter(Cart.user_id == user_id).delete()
-    db.commit()
-
-def save_order_to_json(order_data: dict):
-    """Save order to orders.json file"""
-    orders_file = ORDERS_FILE
-
-    # Load existing orders
-    if os.path.exists(orders_file):
-        with open(orders_file, "r") as f:
-            orders = json.load(f)
-    else:
-        orders = []
-
-    # Add new order
-    orders.append(order_data)
-
-    # Save back to file
-    with open(orders_file, "w") as f:
-        json.dump(orders, f, indent=2)
+    cart_query = select(Cart).where(Cart.user_id == user_id, Cart.product_id.in_(product_ids))
+    try:
+        existing = {cart_item.product_id: cart_item for cart_item in db.execute(cart_query).scalars()}
+        new_rows = stage_cart_items(user_id, quantities, products, existing)
+        if new_rows:
+            db.execute(insert(Cart), new_rows)
+        db.commit()
+    except Exception as exc:
+        db.rollback()
+        for product_id, quantity in quantities.items():
+            undo_stock_reservation(product_id, quantity)
+        if isinstance(exc, IntegrityError):
+            raise HTTPException(status_code=400, detail="Error adding items to cart")
+        raise
+    record_product_write(*product_ids)
+    rows = {cart_item.product_id: cart_item for cart_item in db.execute(cart_query).scalars()}
+    return [rows[product_id] for product_id in product_ids]
 
 
 def remove_from_cart(user_id: int, product_id: int, db: Session) -> None:
@@ -114,15 +177,14 @@ def remove_from_cart(user_id: int, product_id: int, db: Session) -> None:
         raise HTTPException(status_code=404, detail="Cart item not found")
 
     # Restore stock
-    from ..crud.product import get_product
-    product = get_product(product_id, db)
-    product.stock += cart_item.quantity
+    release_stock(product_id, cart_item.quantity, db)
 
     # Remove cart item
     db.delete(cart_item)
 
     try:
         db.commit()
+        record_product_write(product_id)
     except IntegrityError:
         db.rollback()
         raise HTTPException(status_code=400, detail="Error removing from cart")
\ No newline at end of file
@@ -0,0 +1,104 @@
+from typing import Dict, List
+from fastapi import HTTPException
+from sqlalchemy import insert, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.cart import Cart
+from ..models.product import Product
+from .cart import check_batch_stock, merge_cart_items, stage_cart_items
+from .product import record_product_write, undo_stock_reservation
+from .product_async import get_product, reserve_stock, reserve_stock_bulk, release_stock
+
+
+async def create_cart(cart: Cart, db: AsyncSession) -> Cart:
+    """Async equivalent of crud.cart.create_cart."""
+    product = await get_product(cart.product_id, db)
+
+    if not await reserve_stock(product.id, cart.quantity, db):
+        await db.rollback()
+        await db.refresh(product)
+        raise HTTPException(
+            status_code=400,
+            detail=f"insufficient stock. Available: {product.stock}, "
+                   f"Requested: {cart.quantity}")
+
+    error_detail = "Error adding item to cart"
+    try:
+        result = await db.execute(select(Cart).where(
+            Cart.user_id == cart.user_id,
+            Cart.product_id == cart.product_id
+        ))
+        existing_cart_item = result.scalars().first()
+
+        if existing_cart_item:
+            new_total_quantity = existing_cart_item.quantity + cart.quantity
+            existing_cart_item.quantity = new_total_quantity
+            existing_cart_item.total_price = product.price * new_total_quantity
+            item = existing_cart_item
+            error_detail = "Error updating cart"
+        else:
+            db.add(cart)
+            item = cart
+        await db.commit()
+    except Exception as exc:
+        # e.g. "database is locked": the reservation must not leak
+        await db.rollback()
+        undo_stock_reservation(product.id, cart.quantity)
+        if isinstance(exc, IntegrityError):
+            raise HTTPException(status_code=400, detail=error_detail)
+        raise
+    record_product_write(product.id)
+    await db.refresh(item)
+    return item
+
+
+async def create_carts_bulk(user_id: int, items: List[Dict[str, int]], db: AsyncSession) -> List[Cart]:
+    """Async equivalent of crud.cart.create_carts_bulk."""
+    quantities = merge_cart_items(items)
+    product_ids = list(quantities)
+    result = await db.execute(select(Product).where(Product.id.in_(product_ids)))
+    products = {product.id: product for product in result.scalars()}
+    check_batch_stock(quantities, products)
+
+    if not await reserve_stock_bulk(quantities, db):
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="insufficient stock for one or more products")
+
+    cart_query = select(Cart).where(Cart.user_id == user_id, Cart.product_id.in_(product_ids))
+    try:
+        existing = {cart_item.product_id: cart_item for cart_item in (await db.execute(cart_query)).scalars()}
+        new_rows = stage_cart_items(user_id, quantities, products, existing)
+        if new_rows:
+            await db.execute(insert(Cart), new_rows)
+        await db.commit()
+    except Exception as exc:
+        await db.rollback()
+        for product_id, quantity in quantities.items():
+            undo_stock_reservation(product_id, quantity)
+        if isinstance(exc, IntegrityError):
+            raise HTTPException(status_code=400, detail="Error adding items to cart")
+        raise
+    record_product_write(*product_ids)
+    rows = {cart_item.product_id: cart_item for cart_item in (await db.execute(cart_query)).scalars()}
+    return [rows[product_id] for product_id in product_ids]
+
+
+async def remove_from_cart(user_id: int, product_id: int, db: AsyncSession) -> None:
+    """Async equivalent of crud.cart.remove_from_cart."""
+    result = await db.execute(select(Cart).where(
+        Cart.user_id == user_id,
+        Cart.product_id == product_id
+    ))
+    cart_item = result.scalars().first()
+    if not cart_item:
+        raise HTTPException(status_code=404, detail="Cart item not found")
+
+    await release_stock(product_id, cart_item.quantity, db)
+    await db.delete(cart_item)
+
+    try:
+        await db.commit()
+        record_product_write(product_id)
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Error removing from cart")
@@ -0,0 +1,233 @@
+import logging
+import os
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from fastapi import HTTPException
+from sqlalchemy import DateTime, delete, func, insert, literal, select, tuple_
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Insert, Select
+from ..models.cart import Cart
+from ..models.order import Order
+from ..models.user import User
+from ..order_journal import iter_orders, journal_lock, order_journal
+
+ORDER_IMPORT_BATCH_SIZE = 5000
+
+logger = logging.getLogger(__name__)
+
+
+def build_order(order_data: Dict[str, Any]) -> Order:
+    """
+    Build an Order row from checkout data.
+
+    Args:
+        order_data: Order as written to the order journal.
+
+    Returns:
+        The unsaved Order.
+    """
+    return Order(
+        user_id=order_data["user_id"],
+        username=order_data["username"],
+        items=order_data["items"],
+        total_amount=order_data["total_amount"],
+        order_date=datetime.fromisoformat(order_data["order_date"]),
+    )
+
+
+def checkout_statement(user_id: int, username: str, order_date: datetime) -> Insert:
+    """
+    ``INSERT INTO orders ... SELECT`` turning a user's cart into one order.
+
+    Items and total are aggregated by SQLite (``json_group_array``, ``sum``);
+    an empty cart inserts nothing.
+    """
+    item = func.json_object(
+        "product_id", Cart.product_id,
+        "quantity", Cart.quantity,
+        "price", Cart.total_price,
+    )
+    aggregate = (
+        select(
+            literal(user_id),
+            literal(username),
+            func.json_group_array(item),
+            func.sum(Cart.total_price),
+            literal(order_date, DateTime),
+        )
+        .where(Cart.user_id == user_id)
+        .having(func.count() > 0)
+    )
+    columns = ["user_id", "username", "items", "total_amount", "order_date"]
+    return insert(Order).from_select(columns, aggregate)
+
+
+def order_record(order: Order) -> Dict[str, Any]:
+    """The order as written to the order journal."""
+    return {
+        "order_id": order.id,
+        "user_id": order.user_id,
+        "username": order.username,
+        "items": order.items,
+        "total_amount": order.total_amount,
+        "order_date": order.order_date.isoformat(),
+    }
+
+
+def checkout_cart(user_id: int, username: str, db: Session) -> Order:
+    """
+    Turn a user's cart into an order in one transaction.
+
+    One INSERT ... SELECT records the order with its items and total, one
+    DELETE empties the cart, and both commit together, so the round trips
+    do not depend on the cart size. Journaling the order is left to the
+    caller, after the commit.
+
+    Args:
+        user_id: Owner of the cart.
+        username: Stored on the order.
+        db: Database session.
+
+    Returns:
+        The new Order.
+
+    Raises:
+        HTTPException: 400 if the cart is empty.
+    """
+    result = db.execute(checkout_statement(user_id, username, datetime.now()))
+    if result.rowcount == 0:
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Cart is empty")
+    order_id = result.lastrowid
+    db.execute(delete(Cart).where(Cart.user_id == user_id))
+    db.commit()
+    return db.get(Order, order_id)
+
+
+def orders_statement(
+        user_id: Optional[int] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        after: Optional[tuple] = None,
+        limit: int = 20
+) -> Select:
+    """
+    Query for a page of orders, newest first.
+
+    The filters and the ``(order_date, id)`` ordering match ix_orders_user_date
+    (with user_id) or ix_orders_date (without), so a page costs an index
+    range scan of ``limit`` rows however many orders exist.
+
+    Args:
+        user_id: Only this user's orders; None for all users.
+        date_from: Inclusive lower bound on order_date.
+        date_to: Exclusive upper bound on order_date.
+        after: ``(order_date, id)`` of the last order of the previous page.
+        limit: Page size.
+
+    Returns:
+        The SELECT statement.
+    """
+    statement = select(Order)
+    if user_id is not None:
+        statement = statement.where(Order.user_id == user_id)
+    if date_from is not None:
+        statement = statement.where(Order.order_date >= date_from)
+    if date_to is not None:
+        statement = statement.where(Order.order_date < date_to)
+    if after is not None:
+        statement = statement.where(tuple_(Order.order_date, Order.id) < tuple_(*after))
+    return statement.order_by(Order.order_date.desc(), Order.id.desc()).limit(limit)
+
+
+def get_orders(
+        db: Session,
+        user_id: Optional[int] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        after: Optional[tuple] = None,
+        limit: int = 20
+) -> List[Order]:
+    """
+    Retrieve a page of orders, newest first.
+
+    Args:
+        db: Database session.
+        user_id: Only this user's orders; None for all users.
+        date_from: Inclusive lower bound on order_date.
+        date_to: Exclusive upper bound on order_date.
+        after: Keyset cursor, ``(order_date, id)`` of the last order already seen.
+        limit: Maximum number of orders to return.
+
+    Returns:
+        List of Order objects.
+    """
+    statement = orders_statement(user_id, date_from, date_to, after, limit)
+    return list(db.execute(statement).scalars().all())
+
+
+def _order_rows(records: Iterable[Dict[str, Any]]) -> Iterable[Dict[str, Any]]:
+    for record in records:
+        row = build_order(record).model_dump()
+        # Keep journaled IDs; a NULL id (legacy orders) gets the next rowid.
+        row["id"] = record.get("order_id")
+        yield row
+
+
+def _insert_orders_of_known_users(db: Session, batch: List[Dict[str, Any]]) -> int:
+    """Insert the orders whose user_id and username match an existing user; return how many."""
+    user_ids = {row["user_id"] for row in batch}
+    users = dict(db.execute(select(User.id, User.username).where(User.id.in_(user_ids))).all())
+    rows = [row for row in batch if users.get(row["user_id"]) == row["username"]]
+    if rows:
+        db.execute(insert(Order), rows)
+    return len(rows)
+
+
+def _has_orders(db: Session) -> bool:
+    return db.execute(select(Order.id).limit(1)).first() is not None
+
+
+def import_journal_orders(db: Session) -> int:
+    """
+    Fill an empty orders table from the order journal.
+
+    Runs on startup so orders journaled before the table existed (including
+    the migrated orders.json) can be queried. Does nothing once the table
+    has any row. Workers starting together take turns on the journal lock,
+    so only the first one imports. Orders whose user_id and username do not
+    match an existing user (e.g. from another database) are skipped, so they
+    never show up under an unrelated account.
+
+    Args:
+        db: Database session.
+
+    Returns:
+        Number of orders imported.
+    """
+    if _has_orders(db):
+        return 0
+    directory = order_journal.directory
+    os.makedirs(directory, exist_ok=True)
+    with journal_lock(directory):
+        # Another worker may have imported while this one waited; end the
+        # read transaction so the second look sees its commit.
+        db.rollback()
+        if _has_orders(db):
+            return 0
+        count = 0
+        seen = 0
+        batch: List[Dict[str, Any]] = []
+        for row in _order_rows(iter_orders(directory)):
+            batch.append(row)
+            if len(batch) == ORDER_IMPORT_BATCH_SIZE:
+                count += _insert_orders_of_known_users(db, batch)
+                seen += len(batch)
+                batch = []
+        if batch:
+            count += _insert_orders_of_known_users(db, batch)
+            seen += len(batch)
+        db.commit()
+    if seen > count:
+        logger.warning("skipped %d journaled orders of unknown users", seen - count)
+    return count
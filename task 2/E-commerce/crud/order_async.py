@@ -0,0 +1,33 @@
+from datetime import datetime
+from typing import List, Optional
+from fastapi import HTTPException
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.cart import Cart
+from ..models.order import Order
+from .order import checkout_statement, orders_statement
+
+
+async def checkout_cart(user_id: int, username: str, db: AsyncSession) -> Order:
+    """Async equivalent of crud.order.checkout_cart."""
+    result = await db.execute(checkout_statement(user_id, username, datetime.now()))
+    if result.rowcount == 0:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Cart is empty")
+    order_id = result.lastrowid
+    await db.execute(delete(Cart).where(Cart.user_id == user_id))
+    await db.commit()
+    return await db.get(Order, order_id)
+
+
+async def get_orders(
+        db: AsyncSession,
+        user_id: Optional[int] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        after: Optional[tuple] = None,
+        limit: int = 20
+) -> List[Order]:
+    """Async equivalent of crud.order.get_orders."""
+    result = await db.execute(orders_statement(user_id, date_from, date_to, after, limit))
+    return list(result.scalars().all())
@@ -1,10 +1,173 @@
-from typing import List
+from typing import Dict, Iterator, List, Optional, Tuple
 from fastapi import HTTPException
+from sqlalchemy import case, select, update
 from sqlalchemy.exc import IntegrityError
 from ..models.product import Product
 from sqlalchemy.orm import Session
+from ..etag import ResourceVersions
+from ..catalog_cache import catalog_cache
+from ..database_setup import engine
+from ..stock_counter import HOT_SKUS, StripedStockCounter
+from ..search import FullTextIndex, build_match_query
 
+PRODUCT_EXPORT_COLUMNS = ["id", "name", "price", "stock"]
 
+product_versions = ResourceVersions("products")
+product_search_index = FullTextIndex("product_fts", "product", ["name"])
+
+
+def record_product_write(*product_ids: int) -> None:
+    """
+    Invalidate everything derived from the product table after a commit.
+
+    Args:
+        product_ids: IDs of the rows that changed, when known.
+    """
+    product_versions.bump(*product_ids)
+    catalog_cache.invalidate()
+
+
+def _take_stock_statement(product_id: int, quantity: int):
+    """``UPDATE product SET stock = stock - :q WHERE id = :id AND stock >= :q``"""
+    return (
+        update(Product)
+        .where(Product.id == product_id, Product.stock >= quantity)
+        .values(stock=Product.stock - quantity)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _take_stock_bulk_statement(quantities: Dict[int, int]):
+    """_take_stock_statement() for many products in one statement."""
+    wanted = case(quantities, value=Product.id)
+    return (
+        update(Product)
+        .where(Product.id.in_(list(quantities)), Product.stock >= wanted)
+        .values(stock=Product.stock - wanted)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _add_stock_statement(product_id: int, quantity: int):
+    return (
+        update(Product)
+        .where(Product.id == product_id)
+        .values(stock=Product.stock + quantity)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _lease_stock(product_id: int, quantity: int) -> bool:
+    # Own transaction: leased units must stay taken even if the request
+    # that triggered the lease rolls back.
+    with engine.begin() as connection:
+        leased = connection.execute(_take_stock_statement(product_id, quantity)).rowcount == 1
+    if leased:
+        # The row changed even if the reservation is later undone in memory
+        record_product_write(product_id)
+    return leased
+
+
+def _give_back_stock(product_id: int, quantity: int) -> None:
+    with engine.begin() as connection:
+        connection.execute(_add_stock_statement(product_id, quantity))
+    record_product_write(product_id)
+
+
+hot_stock = StripedStockCounter(HOT_SKUS, lease=_lease_stock, give_back=_give_back_stock)
+
+
+def reserve_stock(product_id: int, quantity: int, db: Session) -> bool:
+    """
+    Atomically take stock for a cart in the current transaction.
+
+    A single conditional UPDATE decides: it only matches while enough stock
+    is left, so concurrent buyers can never drive stock below zero. Products
+    listed in HOT_SKUS are served by the in-memory hot_stock counter instead.
+
+    Args:
+        product_id: ID of the product.
+        quantity: Units to reserve.
+        db: Database session.
+
+    Returns:
+        True if the stock was reserved, False if not enough is left (or the
+        product does not exist).
+    """
+    if product_id in hot_stock:
+        return hot_stock.reserve(product_id, quantity)
+    return db.execute(_take_stock_statement(product_id, quantity)).rowcount == 1
+
+
+def reserve_stock_bulk(quantities: Dict[int, int], db: Session) -> bool:
+    """
+    Reserve stock for several products at once, all or nothing.
+
+    Products not in HOT_SKUS are reserved by a single conditional UPDATE; the
+    batch succeeds only if it matched every one of them.
+
+    Args:
+        quantities: Units to reserve per product ID.
+        db: Database session.
+
+    Returns:
+        True if everything was reserved. On False or an exception, in-memory
+        reservations have been undone and the caller must roll back the
+        transaction.
+    """
+    taken = []
+    reserved = False
+    try:
+        for product_id, quantity in quantities.items():
+            if product_id in hot_stock:
+                if not hot_stock.reserve(product_id, quantity):
+                    break
+                taken.append((product_id, quantity))
+        else:
+            rest = {product_id: quantity for product_id, quantity in quantities.items() if product_id not in hot_stock}
+            reserved = not rest or db.execute(_take_stock_bulk_statement(rest)).rowcount == len(rest)
+    finally:
+        # Also on errors (e.g. "database is locked"): memory must not keep the units
+        if not reserved:
+            for product_id, quantity in taken:
+                hot_stock.release(product_id, quantity)
+    return reserved
+
+
+def release_stock(product_id: int, quantity: int, db: Session) -> None:
+    """
+    Atomically put stock back, e.g. when a cart item is removed.
+
+    Args:
+        product_id: ID of the product.
+        quantity: Units to return.
+        db: Database session.
+    """
+    if product_id in hot_stock:
+        hot_stock.release(product_id, quantity)
+        return
+    db.execute(_add_stock_statement(product_id, quantity))
+
+
+def undo_stock_reservation(product_id: int, quantity: int) -> None:
+    """
+    Undo reserve_stock() after its transaction rolled back. Database
+    reservations roll back with the transaction; in-memory ones do not.
+    """
+    if product_id in hot_stock:
+        hot_stock.release(product_id, quantity)
+
+
+def sync_product_search(db: Session, *product_ids: int) -> None:
+    """
+    Update the search index for the given products in the current transaction.
+
+    Args:
+        db: Database session.
+        product_ids: IDs of the created or renamed products.
+    """
+    for statement in product_search_index.sync_statements(product_ids):
+        db.execute(statement)
 
 
 def create_product(product: Product, db: Session) -> Product:
@@ -23,8 +186,11 @@ def create_product(product: Product, db: Session) -> Product:
     db_product = Product(**product.model_dump())
     db.add(db_product)
     try:
+        db.flush()
+        sync_product_search(db, db_product.id)
         db.commit()
         db.refresh(db_product)
+        record_product_write(db_product.id)
         return db_product
     except IntegrityError:
         db.rollback()
@@ -51,20 +217,64 @@ def get_product(product_id: int, db: Session) -> Product:
         raise HTTPException(status_code=404, detail="Product not found")
     return product
 
-def get_products(db: Session, skip: int = 0, limit: int = 10) -> List[Product]:
+def get_products(db: Session, skip: int = 0, limit: int = 10, after_id: Optional[int] = None) -> List[Product]:
     """
     retrieve a list of products with pagination.
 
     Args:
         db: Database session.
-        skip: Number of product to skip.
+        skip: Number of product to skip (ignored when after_id is given).
         limit: Maximum number of records to return.
+        after_id: Keyset cursor; only products with a greater ID are returned.
 
     Returns:
-        List of Product objects.
+        List of Product objects ordered by ID.
     """
 
-    return db.query(Product).offset(skip).limit(limit).all()
+    query = db.query(Product).order_by(Product.id)
+    if after_id is not None:
+        return query.filter(Product.id > after_id).limit(limit).all()
+    return query.offset(skip).limit(limit).all()
+
+
+def search_products(db: Session, q: str, skip: int = 0, limit: int = 10) -> List[Product]:
+    """
+    Full-text search over product names.
+
+    Args:
+        db: Database session.
+        q: Search text; every word is matched as a prefix.
+        skip: Number of results to skip.
+        limit: Maximum number of results to return.
+
+    Returns:
+        Matching products, best match first.
+    """
+    query = build_match_query(q)
+    if query is None:
+        return []
+    statement = select(Product).from_statement(product_search_index.search_statement())
+    return list(db.execute(statement, {"query": query, "limit": limit, "skip": skip}).scalars().all())
+
+
+def iter_products_for_export(db: Session, batch_size: int = 1000) -> Iterator[Tuple]:
+    """
+    Stream every product as a tuple of PRODUCT_EXPORT_COLUMNS, ordered by ID.
+
+    Selects plain columns (no ORM objects) and fetches ``batch_size`` rows
+    at a time, so memory stays flat regardless of table size.
+
+    Args:
+        db: Database session.
+        batch_size: Rows fetched from the cursor per round.
+
+    Yields:
+        One tuple per product.
+    """
+    columns = [getattr(Product, column) for column in PRODUCT_EXPORT_COLUMNS]
+    statement = select(*columns).order_by(Product.id).execution_options(yield_per=batch_size)
+    for row in db.execute(statement):
+        yield tuple(row)
 
 
 def update_product_stock(product_id: int, quantity_change: int, db: Session) -> Product:
@@ -77,6 +287,7 @@ def update_product_stock(product_id: int, quantity_change: int, db: Session) ->
 
     try:
         db.commit()
+        record_product_write(product_id)
         db.refresh(product)
         return product
     except IntegrityError:
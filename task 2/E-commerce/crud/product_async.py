@@ -0,0 +1,134 @@
+from typing import Dict, List, Optional
+from fastapi import HTTPException
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.product import Product
+from ..search import build_match_query
+from .product import (
+    product_search_index,
+    record_product_write,
+    hot_stock,
+    _take_stock_statement,
+    _take_stock_bulk_statement,
+    _add_stock_statement,
+)
+
+
+async def sync_product_search(db: AsyncSession, *product_ids: int) -> None:
+    """Async equivalent of crud.product.sync_product_search."""
+    for statement in product_search_index.sync_statements(product_ids):
+        await db.execute(statement)
+
+
+async def create_product(product: Product, db: AsyncSession) -> Product:
+    """Async equivalent of crud.product.create_product."""
+    db_product = Product(**product.model_dump())
+    db.add(db_product)
+    try:
+        await db.flush()
+        await sync_product_search(db, db_product.id)
+        await db.commit()
+        await db.refresh(db_product)
+        record_product_write(db_product.id)
+        return db_product
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="product already exists")
+
+
+async def get_product(product_id: int, db: AsyncSession) -> Product:
+    """Async equivalent of crud.product.get_product."""
+    product = await db.get(Product, product_id)
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return product
+
+
+async def get_products(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 10,
+        after_id: Optional[int] = None
+) -> List[Product]:
+    """Async equivalent of crud.product.get_products."""
+    statement = select(Product).order_by(Product.id)
+    if after_id is not None:
+        statement = statement.where(Product.id > after_id)
+    else:
+        statement = statement.offset(skip)
+    result = await db.execute(statement.limit(limit))
+    return list(result.scalars().all())
+
+
+async def search_products(db: AsyncSession, q: str, skip: int = 0, limit: int = 10) -> List[Product]:
+    """Async equivalent of crud.product.search_products."""
+    query = build_match_query(q)
+    if query is None:
+        return []
+    statement = select(Product).from_statement(product_search_index.search_statement())
+    result = await db.execute(statement, {"query": query, "limit": limit, "skip": skip})
+    return list(result.scalars().all())
+
+
+async def update_product_stock(product_id: int, quantity_change: int, db: AsyncSession) -> Product:
+    """Async equivalent of crud.product.update_product_stock."""
+    product = await get_product(product_id, db)
+    product.stock += quantity_change
+
+    if product.stock < 0:
+        raise HTTPException(status_code=400, detail="Stock cannot be negative")
+
+    try:
+        await db.commit()
+        record_product_write(product_id)
+        await db.refresh(product)
+        return product
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="Error updating stock")
+
+
+async def reserve_stock(product_id: int, quantity: int, db: AsyncSession) -> bool:
+    """
+    Async equivalent of crud.product.reserve_stock.
+
+    Hot products lease stock through the sync engine, so a lease runs in
+    the threadpool: blocking the event loop on SQLite's busy timeout would
+    stall the very sessions holding the write lock.
+    """
+    if product_id in hot_stock:
+        return (hot_stock.try_reserve(product_id, quantity)
+                or await run_in_threadpool(hot_stock.reserve, product_id, quantity))
+    result = await db.execute(_take_stock_statement(product_id, quantity))
+    return result.rowcount == 1
+
+
+async def reserve_stock_bulk(quantities: Dict[int, int], db: AsyncSession) -> bool:
+    """Async equivalent of crud.product.reserve_stock_bulk."""
+    taken = []
+    reserved = False
+    try:
+        for product_id, quantity in quantities.items():
+            if product_id in hot_stock:
+                if not (hot_stock.try_reserve(product_id, quantity)
+                        or await run_in_threadpool(hot_stock.reserve, product_id, quantity)):
+                    break
+                taken.append((product_id, quantity))
+        else:
+            rest = {product_id: quantity for product_id, quantity in quantities.items() if product_id not in hot_stock}
+            reserved = not rest or (await db.execute(_take_stock_bulk_statement(rest))).rowcount == len(rest)
+    finally:
+        if not reserved:
+            for product_id, quantity in taken:
+                hot_stock.release(product_id, quantity)
+    return reserved
+
+
+async def release_stock(product_id: int, quantity: int, db: AsyncSession) -> None:
+    """Async equivalent of crud.product.release_stock."""
+    if product_id in hot_stock:
+        hot_stock.release(product_id, quantity)
+        return
+    await db.execute(_add_stock_statement(product_id, quantity))
@@ -0,0 +1,25 @@
+from fastapi import HTTPException
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models.user import User
+
+
+async def create_user(user: User, db: AsyncSession) -> User:
+    """Async equivalent of crud.user.create_user."""
+    result = await db.execute(select(User.id).where(User.username == user.username))
+    if result.first():
+        raise HTTPException(status_code=400, detail="Username already registered")
+
+    result = await db.execute(select(User.id).where(User.email == user.email))
+    if result.first():
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    db.add(user)
+    try:
+        await db.commit()
+        await db.refresh(user)
+        return user
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="User registration failed")
@@ -1,10 +1,92 @@
-from sqlalchemy import create_engine
+import os
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import create_async_engine
 
 # Database URL - SQLite database file
 DATABASE_URL = "sqlite:///./e-commerce.db"
+ASYNC_DATABASE_URL = "sqlite+aiosqlite:///./e-commerce.db"
+
+# "sync" (default) or "async": which session the CRUD endpoints use
+DB_MODE = os.getenv("DB_MODE", "sync")
+
+# Named engine profiles: PRAGMAs run on every new connection plus pool settings.
+# "legacy" is the plain SQLite setup (rollback journal, default pool).
+ENGINE_PROFILES = {
+    "legacy": {
+        "pragmas": {},
+        "pool": {},
+    },
+    "wal": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "NORMAL",
+            "mmap_size": 256 * 1024 * 1024,
+            "cache_size": -64 * 1024,
+            "busy_timeout": 5000,
+            "temp_store": "MEMORY",
+        },
+        "pool": {"pool_size": 10, "max_overflow": 20},
+    },
+    "wal-durable": {
+        "pragmas": {
+            "journal_mode": "WAL",
+            "synchronous": "FULL",
+            "mmap_size": 256 * 1024 * 1024,
+            "cache_size": -64 * 1024,
+            "busy_timeout": 5000,
+            "temp_store": "MEMORY",
+        },
+        "pool": {"pool_size": 10, "max_overflow": 20},
+    },
+}
+DB_PROFILE = os.getenv("DB_PROFILE", "wal")
+
+
+def apply_pragmas(engine: Engine, pragmas: dict, read_only: bool = False) -> None:
+    """
+    Run the profile's PRAGMAs on every new connection of an engine.
+
+    Read-only engines skip journal_mode (a database-level setting owned by
+    the writer) and set query_only so any write attempt fails.
+    """
+    statements = [
+        f"PRAGMA {name}={value}" for name, value in pragmas.items()
+        if not (read_only and name == "journal_mode")
+    ]
+    if read_only:
+        statements.append("PRAGMA query_only=ON")
+    if not statements:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.close()
+
+
+profile = ENGINE_PROFILES[DB_PROFILE]
 
 # Create the database engine
 engine = create_engine(
     DATABASE_URL,
-    connect_args={"check_same_thread": False}
+    connect_args={"check_same_thread": False},
+    **profile["pool"]
+)
+apply_pragmas(engine, profile["pragmas"])
+
+# Separate read-only pool for GET routes, so catalog reads never queue
+# behind writers for a connection
+read_engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    **profile["pool"]
 )
+apply_pragmas(read_engine, profile["pragmas"], read_only=True)
+
+# Async engine (requires aiosqlite), only created in async mode
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **profile["pool"]) if DB_MODE == "async" else None
+if async_engine is not None:
+    apply_pragmas(async_engine.sync_engine, profile["pragmas"])
@@ -0,0 +1,60 @@
+import secrets
+import threading
+from typing import Dict, Optional
+from fastapi import Request, Response, status
+
+
+class ResourceVersions:
+    """
+    Version counters for one kind of resource, used to build weak ETags.
+
+    Every write calls bump() after its commit: the collection version moves
+    forward and the touched rows remember the version they changed at. A
+    random per-process epoch is part of every tag, so tags handed out before
+    a restart never match again.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self.epoch = secrets.token_hex(4)
+        self._version = 0
+        self._rows: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def bump(self, *row_ids: int) -> None:
+        """Record a committed write to the collection and, if given, to specific rows."""
+        with self._lock:
+            self._version += 1
+            for row_id in row_ids:
+                self._rows[row_id] = self._version
+
+    def collection_etag(self) -> str:
+        """Weak ETag for any list view of the collection."""
+        return f'W/"{self.name}-{self.epoch}-{self._version}"'
+
+    def row_etag(self, row_id: int) -> str:
+        """Weak ETag for a single row."""
+        return f'W/"{self.name}-{self.epoch}-{self._rows.get(row_id, 0)}-{row_id}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """
+    Check the request's If-None-Match header against an ETag using the weak
+    comparison rules of RFC 9110.
+    """
+    header: Optional[str] = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    opaque = _opaque(etag)
+    return any(_opaque(candidate.strip()) == opaque for candidate in header.split(","))
+
+
+def _opaque(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def not_modified(etag: str) -> Response:
+    """An empty 304 response carrying the current ETag."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
@@ -0,0 +1,51 @@
+import csv
+import io
+import json
+from typing import Iterable, Iterator, List, Sequence
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+EXPORT_CHUNK_SIZE = 64 * 1024
+
+
+def _csv_value(value):
+    """Render list values as ``;``-separated text, the format the importers accept."""
+    if isinstance(value, list):
+        return ";".join(str(item) for item in value)
+    return value
+
+
+def stream_export(rows: Iterable[Sequence], columns: List[str], fmt: str) -> Iterator[bytes]:
+    """
+    Serialize rows to NDJSON or CSV, yielding ~64 KiB chunks.
+
+    Args:
+        rows: Tuples of column values in ``columns`` order.
+        columns: Column names, used as JSON keys or the CSV header.
+        fmt: ``"ndjson"`` or ``"csv"``.
+
+    Yields:
+        Encoded chunks ready to be written to the response.
+    """
+    buffer = io.StringIO()
+    if fmt == "csv":
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([_csv_value(value) for value in row])
+            if buffer.tell() >= EXPORT_CHUNK_SIZE:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+    else:
+        for row in rows:
+            buffer.write(json.dumps(dict(zip(columns, row)), separators=(",", ":")))
+            buffer.write("\n")
+            if buffer.tell() >= EXPORT_CHUNK_SIZE:
+                yield buffer.getvalue().encode()
+                buffer.seek(0)
+                buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue().encode()
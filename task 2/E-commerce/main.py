@@ -1,20 +1,50 @@
 from fastapi import FastAPI
-from .utils import create_db_and_tables, configure_cors, response_time_setup
-from .routers import cart_router, users_router, admin_product_router, public_product_router
+from .utils import create_db_and_tables, configure_cors, response_time_setup, SessionLocal
+from .metrics import configure_metrics, metrics_registry
+from .query_stats import configure_query_stats
+from .profiling import configure_profiling
+from .auth import token_cache, password_pool
+from .catalog_cache import catalog_cache
+from .order_journal import order_journal, migrate_orders_json
+from .crud.order import import_journal_orders
+from .crud.product import hot_stock
+from .database_setup import engine, read_engine, async_engine
+from .routers import cart_router, users_router, admin_product_router, public_product_router, orders_router
 
 app = FastAPI()
 
 configure_cors(app)
 response_time_setup(app)
+configure_profiling(app)
+configure_metrics(app)
+metrics_registry.register_component("token_cache", token_cache.stats)
+metrics_registry.register_component("password_pool", password_pool.stats)
+metrics_registry.register_component("catalog_cache", catalog_cache.stats)
+metrics_registry.register_component("order_journal", order_journal.stats)
+metrics_registry.register_component("hot_stock", hot_stock.stats)
+configure_query_stats(app, engine, read_engine, async_engine)
 
 app.include_router(users_router)
 app.include_router(cart_router)
+app.include_router(orders_router)
 app.include_router(admin_product_router)
 app.include_router(public_product_router)
 
 
 @app.on_event("startup")
 async def startup_event():
-    """Create database tables on startup"""
+    """Create database tables, import orders.json and the order journal, and start the hot-SKU flusher on startup"""
     create_db_and_tables()
+    migrate_orders_json()
+    with SessionLocal() as db:
+        import_journal_orders(db)
+    hot_stock.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Write out queued orders and return stock held in memory for hot products"""
+    order_journal.close()
+    hot_stock.stop()
+
 
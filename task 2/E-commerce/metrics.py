@@ -0,0 +1,161 @@
+import bisect
+import time
+from typing import Callable, Dict, List, Sequence, Tuple
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse
+from starlette.routing import Match
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+UNMATCHED_ROUTE = "unmatched"
+
+
+class Histogram:
+    """Cumulative-on-export latency histogram with fixed bucket bounds."""
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    In-process request metrics: latency histograms per (method, route, status),
+    in-flight gauges per (method, route) and error counters, plus the
+    ``stats()`` of registered components (caches, pools), exported as gauges.
+
+    Recording happens in the HTTP middleware, which always runs on the event
+    loop thread, so the hot path is plain dict and int updates without locks.
+    """
+
+    def __init__(self, buckets: Sequence[float] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.latency: Dict[Tuple[str, str, str], Histogram] = {}
+        self.in_flight: Dict[Tuple[str, str], int] = {}
+        self.errors: Dict[Tuple[str, str, str], int] = {}
+        self.components: Dict[str, Callable[[], Dict[str, float]]] = {}
+
+    def register_component(self, name: str, stats: Callable[[], Dict[str, float]]) -> None:
+        """
+        Export a component's counters at every scrape.
+
+        Args:
+            name: Metric name prefix, e.g. ``token_cache``.
+            stats: Returns the current values by name; each becomes a gauge
+                called ``<name>_<key>``.
+        """
+        self.components[name] = stats
+
+    def start(self, method: str, route: str) -> None:
+        key = (method, route)
+        self.in_flight[key] = self.in_flight.get(key, 0) + 1
+
+    def finish(self, method: str, route: str, status: int, duration: float) -> None:
+        self.in_flight[(method, route)] -= 1
+        key = (method, route, str(status))
+        histogram = self.latency.get(key)
+        if histogram is None:
+            histogram = self.latency[key] = Histogram(self.buckets)
+        histogram.observe(duration)
+        if status >= 400:
+            self.errors[key] = self.errors.get(key, 0) + 1
+
+    def reset(self) -> None:
+        self.latency.clear()
+        self.in_flight.clear()
+        self.errors.clear()
+
+    def render(self) -> str:
+        """Export every metric in the Prometheus text exposition format."""
+        lines: List[str] = [
+            "# HELP http_request_duration_seconds Request latency by route, method and status.",
+            "# TYPE http_request_duration_seconds histogram",
+        ]
+        for (method, route, status), histogram in sorted(self.latency.items()):
+            labels = f'method="{method}",route="{_escape(route)}",status="{status}"'
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets, histogram.counts):
+                cumulative += bucket_count
+                lines.append(f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {histogram.count}')
+            lines.append(f"http_request_duration_seconds_sum{{{labels}}} {histogram.sum}")
+            lines.append(f"http_request_duration_seconds_count{{{labels}}} {histogram.count}")
+
+        lines.append("# HELP http_requests_in_progress Requests currently being served.")
+        lines.append("# TYPE http_requests_in_progress gauge")
+        for (method, route), value in sorted(self.in_flight.items()):
+            lines.append(f'http_requests_in_progress{{method="{method}",route="{_escape(route)}"}} {value}')
+
+        lines.append("# HELP http_request_errors_total Responses with a 4xx or 5xx status.")
+        lines.append("# TYPE http_request_errors_total counter")
+        for (method, route, status), value in sorted(self.errors.items()):
+            lines.append(
+                f'http_request_errors_total{{method="{method}",route="{_escape(route)}",status="{status}"}} {value}'
+            )
+
+        for name, stats in sorted(self.components.items()):
+            for key, value in stats().items():
+                lines.append(f"# TYPE {name}_{key} gauge")
+                lines.append(f"{name}_{key} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def resolve_route(app: FastAPI, scope: dict) -> str:
+    """
+    Return the path template (e.g. ``/products/{product_id}``) of the route
+    that will handle a request, so metrics are labelled per endpoint rather
+    than per concrete URL.
+    """
+    partial = None
+    for route in app.router.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path
+    return partial or UNMATCHED_ROUTE
+
+
+metrics_registry = MetricsRegistry()
+
+
+def configure_metrics(app: FastAPI, registry: MetricsRegistry = metrics_registry) -> None:
+    """
+    Record request metrics in a middleware and expose them at ``GET /metrics``.
+
+    Args:
+        app: The FastAPI app.
+        registry: Registry to record into.
+    """
+
+    @app.middleware("http")
+    async def record_metrics(request: Request, call_next):
+        method = request.method
+        route = resolve_route(app, request.scope)
+        registry.start(method, route)
+        start_time = time.perf_counter()
+        status = 500
+        try:
+            response = await call_next(request)
+            status = response.status_code
+            return response
+        finally:
+            registry.finish(method, route, status, time.perf_counter() - start_time)
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics() -> PlainTextResponse:
+        return PlainTextResponse(registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,9 +1,11 @@
 from .user import User
 from .cart import Cart
 from .product import Product
+from .order import Order
 
 __all__=[
     "User",
     "Cart",
-    "Product"
+    "Product",
+    "Order",
 ]
\ No newline at end of file
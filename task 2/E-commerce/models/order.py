@@ -0,0 +1,22 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlalchemy import JSON, Column, DateTime, Index
+from sqlmodel import SQLModel, Field
+
+
+class Order(SQLModel, table=True):
+    __tablename__ = "orders"
+    # Order history is read newest first, per user or across all users;
+    # both indexes end in id so keyset pages never need a sort.
+    __table_args__ = (
+        Index("ix_orders_user_date", "user_id", "order_date", "id"),
+        Index("ix_orders_date", "order_date", "id"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    user_id: int = Field(foreign_key="user.id")
+    username: str
+    items: List[Dict[str, Any]] = Field(default_factory=list, sa_column=Column(JSON))
+    total_amount: float
+    # Naive local time, as checkout has always written it
+    order_date: datetime = Field(sa_column=Column(DateTime, nullable=False))
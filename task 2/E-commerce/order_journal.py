@@ -0,0 +1,277 @@
+import json
+import os
+import queue
+import re
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+TASK_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+# Legacy JSON array written by earlier versions; imported once by migrate_orders_json()
+ORDERS_FILE = os.path.join(TASK_DIR, "orders.json")
+ORDER_JOURNAL_DIR = os.getenv("ORDER_JOURNAL_DIR", os.path.join(TASK_DIR, "orders"))
+# How long the writer waits for more orders before one fsync covers them all
+ORDER_FSYNC_WINDOW_MS = float(os.getenv("ORDER_FSYNC_WINDOW_MS", 2))
+ORDER_SEGMENT_MAX_BYTES = int(os.getenv("ORDER_SEGMENT_MAX_BYTES", 64 * 1024 * 1024))
+
+SEGMENT_NAME = re.compile(r"^orders-(\d{6})\.ndjson$")
+
+
+def segment_name(number: int) -> str:
+    return f"orders-{number:06d}.ndjson"
+
+
+def journal_lock(directory: str = ORDER_JOURNAL_DIR) -> "FileLock":
+    """The lock serializing appends, rotation and imports across processes."""
+    return FileLock(os.path.join(directory, "journal.lock"))
+
+
+class FileLock:
+    """Exclusive advisory lock on a file, shared by every process using the same path."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    def __enter__(self) -> "FileLock":
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        else:
+            msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        os.close(self._fd)
+        self._fd = None
+
+
+class OrderJournal:
+    """
+    Append-only order log made of numbered NDJSON segments.
+
+    Records are queued to a single writer thread, which gathers everything
+    arriving within ``fsync_window`` seconds, appends the batch under a
+    cross-process file lock and fsyncs once for the whole batch (group
+    commit). A record's future resolves only after its fsync, so callers
+    that wait on it never report an order that could be lost. The active
+    segment rolls over to a new file once it reaches ``segment_max_bytes``.
+    """
+
+    def __init__(
+            self,
+            directory: str = ORDER_JOURNAL_DIR,
+            fsync_window: float = ORDER_FSYNC_WINDOW_MS / 1000,
+            segment_max_bytes: int = ORDER_SEGMENT_MAX_BYTES
+    ):
+        self.directory = directory
+        self.fsync_window = fsync_window
+        self.segment_max_bytes = segment_max_bytes
+        self._queue: "queue.Queue[Optional[Tuple[bytes, Future]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._segment: Optional[str] = None
+        self._fd: Optional[int] = None
+        self._torn = False
+        self.batches = 0
+        self.records = 0
+
+    def submit(self, record: Dict[str, Any]) -> "Future[None]":
+        """
+        Queue a record for appending.
+
+        Args:
+            record: JSON-serializable order data.
+
+        Returns:
+            A future resolved once the record is durable on disk.
+        """
+        line = (json.dumps(record, separators=(",", ":")) + "\n").encode()
+        future: "Future[None]" = Future()
+        self._ensure_started()
+        self._queue.put((line, future))
+        return future
+
+    def append(self, record: Dict[str, Any]) -> None:
+        """Append a record and block until it is durable."""
+        self.submit(record).result()
+
+    def close(self) -> None:
+        """Write out everything queued and stop the writer thread."""
+        with self._start_lock:
+            if self._thread is None:
+                return
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+        self._close_segment()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self._thread = threading.Thread(target=self._run, name="order-journal", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = time.monotonic() + self.fsync_window
+            while True:
+                try:
+                    item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            self._write_batch(batch)
+
+    def _write_batch(self, batch: List[Tuple[bytes, Future]]) -> None:
+        data = b"".join(line for line, _ in batch)
+        try:
+            with journal_lock(self.directory):
+                fd = self._active_segment(len(data))
+                view = memoryview(data)
+                while view:
+                    view = view[os.write(fd, view):]
+                os.fsync(fd)
+        except BaseException as exc:
+            # The segment may now end in a partial line; start a fresh one.
+            self._torn = True
+            self._close_segment()
+            for _, future in batch:
+                future.set_exception(exc)
+            return
+        self.batches += 1
+        self.records += len(batch)
+        for _, future in batch:
+            future.set_result(None)
+
+    def _active_segment(self, incoming: int) -> int:
+        """
+        Return a descriptor for the segment to append to, rolling over when
+        it is full. Called with the file lock held: other processes may have
+        rotated since the last batch, so the directory is the source of truth.
+        """
+        numbers = list_segments(self.directory)
+        # Segment 0 holds migrated orders; appends start at 1.
+        number = max(numbers[-1] if numbers else 1, 1)
+        fd = self._open_segment(number)
+        size = os.fstat(fd).st_size
+        if size and (self._torn or size + incoming > self.segment_max_bytes):
+            fd = self._open_segment(number + 1)
+            _fsync_directory(self.directory)
+        self._torn = False
+        return fd
+
+    def _open_segment(self, number: int) -> int:
+        name = segment_name(number)
+        if name != self._segment:
+            self._close_segment()
+            path = os.path.join(self.directory, name)
+            self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            self._segment = name
+        return self._fd
+
+    def _close_segment(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+        self._fd = None
+        self._segment = None
+
+    def stats(self) -> Dict[str, int]:
+        """Return batch/record counters and the queue length."""
+        return {
+            "batches": self.batches,
+            "records": self.records,
+            "queued": self._queue.qsize(),
+        }
+
+
+def list_segments(directory: str = ORDER_JOURNAL_DIR) -> List[int]:
+    """Numbers of the segments in ``directory``, oldest first."""
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    return sorted(int(match.group(1)) for match in map(SEGMENT_NAME.match, names) if match)
+
+
+def iter_orders(directory: str = ORDER_JOURNAL_DIR) -> Iterator[Dict[str, Any]]:
+    """
+    Yield every journaled order, oldest segment first.
+
+    A torn last line (a crash mid-write) is skipped.
+    """
+    for number in list_segments(directory):
+        with open(os.path.join(directory, segment_name(number)), "rb") as f:
+            for line in f:
+                if line.endswith(b"\n"):
+                    yield json.loads(line)
+
+
+def _fsync_directory(directory: str) -> None:
+    if fcntl is None:
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def migrate_orders_json(source: str = ORDERS_FILE, directory: str = ORDER_JOURNAL_DIR) -> int:
+    """
+    Import the legacy ``orders.json`` array into the journal, once.
+
+    The orders become segment 0, ahead of everything appended later. The
+    segment is written to a temporary file and renamed into place, so its
+    existence marks the migration as done and a crash never leaves half of
+    it behind. The source file is left untouched.
+
+    Args:
+        source: Path of the JSON array file.
+        directory: Journal directory.
+
+    Returns:
+        Number of orders imported (0 if already migrated or nothing to import).
+    """
+    os.makedirs(directory, exist_ok=True)
+    target = os.path.join(directory, segment_name(0))
+    with journal_lock(directory):
+        if os.path.exists(target) or not os.path.exists(source):
+            return 0
+        with open(source, "r") as f:
+            orders = json.load(f)
+        tmp = target + ".tmp"
+        with open(tmp, "w") as f:
+            for order in orders:
+                f.write(json.dumps(order, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, target)
+        _fsync_directory(directory)
+    return len(orders)
+
+
+order_journal = OrderJournal()
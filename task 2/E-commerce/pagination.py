@@ -0,0 +1,66 @@
+import base64
+import json
+from typing import Any, Dict, Tuple
+from fastapi import HTTPException
+
+
+def encode_cursor(last_id: int, **keys: Any) -> str:
+    """
+    Encode the last primary key of a page as an opaque cursor.
+
+    Args:
+        last_id: ID of the last row on the page.
+        keys: Other sort key values of that row, for pages not ordered by ID.
+
+    Returns:
+        URL-safe cursor string.
+    """
+    raw = json.dumps({"id": last_id, **keys}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _load_cursor(cursor: str) -> Dict[str, Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(payload, dict) or not isinstance(payload.get("id"), int):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return payload
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decode a cursor produced by encode_cursor().
+
+    Args:
+        cursor: Cursor string from the ``X-Next-Cursor`` header.
+
+    Returns:
+        The primary key to continue after.
+
+    Raises:
+        HTTPException: if the cursor is malformed.
+    """
+    return _load_cursor(cursor)["id"]
+
+
+def decode_cursor_key(cursor: str, key: str) -> Tuple[int, str]:
+    """
+    Decode a cursor carrying one extra sort key besides the ID.
+
+    Args:
+        cursor: Cursor string from the ``X-Next-Cursor`` header.
+        key: Name of the extra key passed to encode_cursor().
+
+    Returns:
+        The primary key and the string value of ``key``.
+
+    Raises:
+        HTTPException: if the cursor is malformed or lacks ``key``.
+    """
+    payload = _load_cursor(cursor)
+    if not isinstance(payload.get(key), str):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return payload["id"], payload[key]
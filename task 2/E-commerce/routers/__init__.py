@@ -2,10 +2,12 @@ from .product import admin_router as admin_product_router
 from .product import public_router as public_product_router
 from .cart import router as cart_router
 from .user import router as users_router
+from .order import router as orders_router
 
 __all__ = [
     "admin_product_router",
     "public_product_router",
     "cart_router",
     "users_router",
+    "orders_router",
 ]
\ No newline at end of file
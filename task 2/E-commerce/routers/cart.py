@@ -1,26 +1,35 @@
-from datetime import datetime
+import asyncio
+import logging
 from typing import List
 from fastapi import APIRouter, Depends, status, HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from ..utils import get_session
-from ..crud.cart import create_cart, get_user_cart, clear_user_cart, save_order_to_json
-from ..schemas.cart import CartAdd, CartResponse
+from ..utils import get_db_session
+from ..crud.cart import create_cart, create_carts_bulk
+from ..order_journal import order_journal
+from ..schemas.cart import CartAdd, CartAddBatch, CartResponse
 from ..models import Cart, User
 from ..auth import get_current_user
 from ..crud.product import get_product
+from ..crud import cart_async, product_async, order_async
+from ..crud.order import checkout_cart, order_record
 
 router = APIRouter(prefix="/cart", tags=["cart"])
+logger = logging.getLogger(__name__)
 
 @router.post("/add/", response_model=CartResponse, status_code=status.HTTP_201_CREATED)
 async def add_to_cart_endpoint(
         cart_item: CartAdd,
-        db: Session = Depends(get_session),
+        db: Session = Depends(get_db_session),
         current_user: User = Depends(get_current_user)
 ):
     """Add item to cart with stock validation"""
     try:
         # get product to calculate price
-        product = get_product(cart_item.product_id, db)
+        if isinstance(db, AsyncSession):
+            product = await product_async.get_product(cart_item.product_id, db)
+        else:
+            product = get_product(cart_item.product_id, db)
         total_price = product.price * cart_item.quantity
 
         db_cart = Cart(
@@ -29,6 +38,8 @@ async def add_to_cart_endpoint(
             quantity=cart_item.quantity,
             total_price=total_price
         )
+        if isinstance(db, AsyncSession):
+            return await cart_async.create_cart(db_cart, db)
         return create_cart(db_cart, db)
     except HTTPException:
         # rewrite HTTP Exceptions like insufficient stock
@@ -37,42 +48,48 @@ async def add_to_cart_endpoint(
         raise HTTPException(status_code=500, detail="internal server error")
 
 
+@router.post("/add/batch", response_model=List[CartResponse], status_code=status.HTTP_201_CREATED)
+async def add_batch_to_cart_endpoint(
+        batch: CartAddBatch,
+        db: Session = Depends(get_db_session),
+        current_user: User = Depends(get_current_user)
+):
+    """
+    Add several items to the cart at once.
+
+    Stock is checked for the whole batch and the batch is committed in one
+    transaction: either every item is added or none is. Repeated products
+    are summed.
+    """
+    items = [item.model_dump() for item in batch.items]
+    if isinstance(db, AsyncSession):
+        return await cart_async.create_carts_bulk(current_user.id, items, db)
+    return create_carts_bulk(current_user.id, items, db)
+
+
 @router.post("/checkout/", status_code=status.HTTP_200_OK)
 async def checkout_endpoint(
-        db: Session = Depends(get_session),
+        db: Session = Depends(get_db_session),
         current_user: User = Depends(get_current_user)
 ):
-    """Checkout cart and create order"""
-    # Get user's cart items
-    cart_items = get_user_cart(current_user.id, db)
-    
-    if not cart_items:
-        raise HTTPException(status_code=400, detail="Cart is empty")
-    
-    # Calculate total order amount
-    total_amount = sum(item.total_price for item in cart_items)
-    
-    # Create order data
-    order_data = {
-        "user_id": current_user.id,
-        "username": current_user.username,
-        "items": [
-            {
-                "product_id": item.product_id,
-                "quantity": item.quantity,
-                "price": item.total_price
-            }
-            for item in cart_items
-        ],
-        "total_amount": total_amount,
-        "order_date": datetime.now().isoformat()
-    }
-    
-    # Save order to orders.json (requirement)
-    save_order_to_json(order_data)
-    
-    # Clear user's cart after successful checkout
-    clear_user_cart(current_user.id, db)
-    
-    return {"message": "Order placed successfully", "order_total": total_amount}
+    """
+    Checkout cart and create order.
+
+    The order is recorded and the cart emptied in one transaction; the
+    order is journaled after the commit. The orders table is the source of
+    truth, so a failed journal write is logged and the order still succeeds.
+    """
+    if isinstance(db, AsyncSession):
+        order = await order_async.checkout_cart(current_user.id, current_user.username, db)
+    else:
+        order = checkout_cart(current_user.id, current_user.username, db)
+
+    # Append to the order journal; resolves once the order is fsynced
+    try:
+        await asyncio.wrap_future(order_journal.submit(order_record(order)))
+    except Exception:
+        # e.g. disk full: the order is committed, so reporting a failure
+        # would only invite the client to buy again
+        logger.exception("could not journal order %s", order.id)
 
+    return {"message": "Order placed successfully", "order_total": order.total_amount}
@@ -0,0 +1,64 @@
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from ..utils import get_db_read_session
+from ..pagination import encode_cursor, decode_cursor_key
+from ..crud.order import get_orders
+from ..crud import order_async
+from ..schemas.order import OrderResponse
+from ..models import User
+from ..auth import get_current_user
+
+router = APIRouter(prefix="/orders", tags=["orders"])
+
+
+def _local(value: Optional[datetime]) -> Optional[datetime]:
+    """Order dates are naive local time; convert aware query bounds to match."""
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone().replace(tzinfo=None)
+
+
+@router.get("/", response_model=List[OrderResponse])
+async def get_orders_endpoint(
+        response: Response,
+        user_id: Optional[int] = None,
+        date_from: Optional[datetime] = None,
+        date_to: Optional[datetime] = None,
+        after: Optional[str] = None,
+        limit: int = Query(20, gt=0, le=100),
+        db: Session = Depends(get_db_read_session),
+        current_user: User = Depends(get_current_user)
+):
+    """
+    List orders, newest first.
+
+    Users see their own orders; admins see everyone's, optionally narrowed to
+    ``user_id``. ``date_from`` (inclusive) and ``date_to`` (exclusive) bound
+    the order date. Full pages carry an ``X-Next-Cursor`` header; pass it
+    back as ``after`` to fetch the next page.
+    """
+    if not current_user.is_admin:
+        if user_id is not None and user_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Not allowed to view other users' orders")
+        user_id = current_user.id
+
+    date_from, date_to = _local(date_from), _local(date_to)
+    cursor = None
+    if after:
+        last_id, last_date = decode_cursor_key(after, "order_date")
+        try:
+            cursor = (datetime.fromisoformat(last_date), last_id)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if isinstance(db, AsyncSession):
+        orders = await order_async.get_orders(db, user_id, date_from, date_to, cursor, limit)
+    else:
+        orders = get_orders(db, user_id, date_from, date_to, cursor, limit)
+    if orders and len(orders) == limit:
+        last = orders[-1]
+        response.headers["X-Next-Cursor"] = encode_cursor(last.id, order_date=last.order_date.isoformat())
+    return orders
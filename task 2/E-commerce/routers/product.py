@@ -1,12 +1,24 @@
-from typing import List
-from fastapi import APIRouter, Depends, status
+from typing import List, Optional
+from fastapi import APIRouter, Depends, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from ..utils import get_session
+from ..utils import get_db_session, get_db_read_session, ReadSessionLocal
+from ..export import stream_export, EXPORT_MEDIA_TYPES
+from ..pagination import decode_cursor
+from ..etag import etag_matches, not_modified
+from ..catalog_cache import catalog_cache, render_catalog_page
 from ..crud.product import (
     create_product,
     get_product,
-    get_products
+    get_products,
+    search_products,
+    iter_products_for_export,
+    PRODUCT_EXPORT_COLUMNS,
+    product_versions,
 )
+from ..crud import product_async
 from ..schemas.product import ProductUpdate,ProductResponse, ProductCreate
 from ..models import Product, User
 from ..auth import get_current_admin_user
@@ -20,23 +32,100 @@ public_router = APIRouter(prefix="/products", tags=["products"])
 @admin_router.post("/products/", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
 async def create_product_endpoint(
         product: ProductCreate,
-        db: Session = Depends(get_session),
+        db: Session = Depends(get_db_session),
         current_user: User = Depends(get_current_admin_user)
 ):
     """Create a new product (admin only)"""
     db_product = Product(**product.model_dump())
+    if isinstance(db, AsyncSession):
+        return await product_async.create_product(db_product, db)
     return create_product(db_product, db)
 
 @public_router.get("/", response_model=List[ProductResponse])
 async def get_products_endpoint(
-        db: Session = Depends(get_session),
-        skip: int = 0,
-        limit: int = 10
+        request: Request,
+        db: Session = Depends(get_db_read_session),
+        skip: int = Query(0, ge=0),
+        limit: int = Query(10, gt=0, le=100),
+        after: Optional[str] = None
 ):
-    """Get all products (public endpoint)"""
-    return get_products(db, skip, limit)
+    """
+    Get all products (public endpoint).
+
+    Full pages carry an ``X-Next-Cursor`` header; pass it back as ``after``
+    to fetch the next page with a keyset scan instead of an offset. Pages are
+    served from the rendered-page cache while the catalog ETag is unchanged.
+    """
+    etag = product_versions.collection_etag()
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    after_id = decode_cursor(after) if after else None
+    # A cursor makes the offset irrelevant; keep it out of the key.
+    key = (0 if after_id is not None else skip, limit, after_id)
+
+    async def load():
+        if isinstance(db, AsyncSession):
+            products = await product_async.get_products(db, skip, limit, after_id=after_id)
+        else:
+            products = await run_in_threadpool(get_products, db, skip, limit, after_id=after_id)
+        return render_catalog_page(products, limit)
+
+    page = await catalog_cache.get_or_load(key, etag, load)
+    headers = {"ETag": etag}
+    if page.next_cursor:
+        headers["X-Next-Cursor"] = page.next_cursor
+    return Response(content=page.body, media_type="application/json", headers=headers)
+
+@public_router.get("/search", response_model=List[ProductResponse])
+async def search_products_endpoint(
+        q: str = Query(..., min_length=1, max_length=200),
+        skip: int = Query(0, ge=0),
+        limit: int = Query(10, gt=0, le=100),
+        db: Session = Depends(get_db_read_session)
+):
+    """
+    Full-text search over product names (public endpoint).
+
+    Each word of ``q`` matches as a prefix; results are ranked by relevance.
+    """
+    if isinstance(db, AsyncSession):
+        return await product_async.search_products(db, q, skip=skip, limit=limit)
+    return search_products(db, q, skip=skip, limit=limit)
+
+@public_router.get("/export")
+async def export_products_endpoint(fmt: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$")):
+    """Stream every product as NDJSON or CSV (public endpoint)"""
+    def rows():
+        # The response body is produced after this handler returns, so the
+        # stream owns its session instead of borrowing the request's one.
+        with ReadSessionLocal() as db:
+            yield from iter_products_for_export(db)
+
+    return StreamingResponse(
+        stream_export(rows(), PRODUCT_EXPORT_COLUMNS, fmt),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="products.{fmt}"'},
+    )
 
 @public_router.get("/{product_id}", response_model=ProductResponse)
-async def get_product_endpoint(product_id: int, db: Session = Depends(get_session)):
-    """Get a product by ID (public endpoint)"""
+async def get_product_endpoint(
+        product_id: int,
+        request: Request,
+        response: Response,
+        db: Session = Depends(get_db_read_session)
+):
+    """
+    Get a product by ID (public endpoint).
+
+    Answers 304 without touching the database when ``If-None-Match`` holds
+    the current ETag.
+    """
+    # Take the tag before reading: a write racing with the read can only
+    # make the tag older than the body, never newer.
+    etag = product_versions.row_etag(product_id)
+    if etag_matches(request, etag):
+        return not_modified(etag)
+    response.headers["ETag"] = etag
+    if isinstance(db, AsyncSession):
+        return await product_async.get_product(product_id, db)
     return get_product(product_id, db)
\ No newline at end of file
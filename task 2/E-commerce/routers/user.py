@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from ..utils import get_session
-from ..auth import authenticate_user, create_access_token, hash_password
+from ..utils import get_session, get_db_session
+from ..auth import authenticate_user, create_access_token, hash_password, password_pool
 from ..schemas.auth import Token
 from ..schemas.user import UserCreate, UserResponse
 from ..crud.user import create_user
+from ..crud import user_async
 from ..models.user import User
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -16,17 +18,17 @@ async def login_for_access_token(
     db: Session = Depends(get_session)
 ):
     """Login endpoint to get access token"""
-    user = authenticate_user(form_data.username, form_data.password, db)
+    user = await password_pool.run(authenticate_user, form_data.username, form_data.password, db)
     access_token = create_access_token(data={"sub": user.username})
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.post("/register", response_model=UserResponse, status_code=status.HTTP_201_CREATED)
 async def register_user(
     user_data: UserCreate,
-    db: Session = Depends(get_session)
+    db: Session = Depends(get_db_session)
 ):
     """Register a new user"""
-    hashed_password = hash_password(user_data.password)
+    hashed_password = await password_pool.run(hash_password, user_data.password)
     db_user = User(
         name=user_data.name,
         username=user_data.username,
@@ -37,4 +39,6 @@ async def register_user(
         is_admin=user_data.is_admin  # Regular users are not admin by default
     )
 
+    if isinstance(db, AsyncSession):
+        return await user_async.create_user(db_user, db)
     return create_user(db_user, db)
\ No newline at end of file
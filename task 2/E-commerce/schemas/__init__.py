@@ -1,6 +1,7 @@
 from .user import UserCreate, UserLogin, UserResponse
 from .product import ProductResponse, ProductCreate, ProductUpdate
-from .cart import CartAdd, CartResponse
+from .cart import MAX_CART_BATCH_ITEMS, CartAdd, CartAddBatch, CartResponse
+from .order import OrderItem, OrderResponse
 from .auth import Token, TokenData
 
 __all__=[
@@ -10,8 +11,12 @@ __all__=[
     "ProductResponse",
     "ProductCreate",
     "ProductUpdate",
+    "MAX_CART_BATCH_ITEMS",
     "CartAdd",
+    "CartAddBatch",
     "CartResponse",
+    "OrderItem",
+    "OrderResponse",
     "Token",
     "TokenData",
 ]
\ No newline at end of file
@@ -1,11 +1,17 @@
-from pydantic import BaseModel
+from typing import List
+from pydantic import BaseModel, Field
 from pydantic import ConfigDict, conint
 
+MAX_CART_BATCH_ITEMS = 100
+
 
 class CartAdd(BaseModel):
     product_id: int
     quantity: conint(gt=0)
 
+class CartAddBatch(BaseModel):
+    items: List[CartAdd] = Field(..., min_length=1, max_length=MAX_CART_BATCH_ITEMS)
+
 class CartResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
     product_id: int
@@ -0,0 +1,20 @@
+from datetime import datetime
+from typing import List
+from pydantic import BaseModel
+from pydantic import ConfigDict
+
+
+class OrderItem(BaseModel):
+    product_id: int
+    quantity: int
+    price: float
+
+
+class OrderResponse(BaseModel):
+    model_config = ConfigDict(from_attributes=True)
+    id: int
+    user_id: int
+    username: str
+    items: List[OrderItem]
+    total_amount: float
+    order_date: datetime
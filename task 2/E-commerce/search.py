@@ -0,0 +1,83 @@
+import re
+from typing import List, Optional, Sequence
+from sqlalchemy import bindparam, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.sql.elements import TextClause
+
+SEARCH_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_query(q: str) -> Optional[str]:
+    """
+    Turn free text into an FTS5 MATCH expression.
+
+    Every word becomes a quoted prefix term (``"ali"*``), so user input can
+    never be parsed as FTS5 syntax, and all words must match.
+
+    Args:
+        q: Raw search text.
+
+    Returns:
+        The MATCH expression, or None if the text has no searchable words.
+    """
+    tokens = SEARCH_TOKEN.findall(q)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+class FullTextIndex:
+    """
+    An FTS5 table mirroring some text columns of a source table.
+
+    The index row shares the source row's ``id`` as its rowid. It is kept in
+    sync explicitly: write paths execute sync_statements() for the IDs they
+    touched, inside the same transaction as the write.
+    """
+
+    def __init__(self, name: str, source: str, columns: Sequence[str]):
+        self.name = name
+        self.source = source
+        self.columns = ", ".join(columns)
+
+    def create(self, connection: Connection) -> None:
+        """Create the FTS5 table if missing and fill it from the source table."""
+        exists = connection.execute(
+            text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": self.name}
+        ).first()
+        if exists:
+            return
+        connection.execute(text(
+            f"CREATE VIRTUAL TABLE {self.name} USING fts5("
+            f"{self.columns}, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        ))
+        connection.execute(text(
+            f"INSERT INTO {self.name} (rowid, {self.columns}) SELECT id, {self.columns} FROM {self.source}"
+        ))
+
+    def sync_statements(self, ids: Sequence[int]) -> List[TextClause]:
+        """
+        Statements that bring the index rows of ``ids`` in line with the
+        source table; rows no longer in the source are simply removed.
+        """
+        ids = list(ids)
+        return [
+            text(f"DELETE FROM {self.name} WHERE rowid IN :ids").bindparams(
+                bindparam("ids", value=ids, expanding=True)
+            ),
+            text(
+                f"INSERT INTO {self.name} (rowid, {self.columns}) "
+                f"SELECT id, {self.columns} FROM {self.source} WHERE id IN :ids"
+            ).bindparams(bindparam("ids", value=ids, expanding=True)),
+        ]
+
+    def search_statement(self) -> TextClause:
+        """
+        Source rows matching ``:query``, best bm25 rank first, paginated by
+        ``:limit`` and ``:skip``.
+        """
+        return text(
+            f"SELECT {self.source}.* FROM {self.name} "
+            f"JOIN {self.source} ON {self.source}.id = {self.name}.rowid "
+            f"WHERE {self.name} MATCH :query ORDER BY {self.name}.rank LIMIT :limit OFFSET :skip"
+        )
@@ -0,0 +1,181 @@
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Comma-separated product IDs whose stock is reserved in memory (empty: none)
+HOT_SKUS = {int(product_id) for product_id in os.getenv("HOT_SKUS", "").split(",") if product_id.strip()}
+HOT_SKU_STRIPES = int(os.getenv("HOT_SKU_STRIPES", 8))
+# Units moved from the product row into memory per database round trip
+HOT_SKU_LEASE = int(os.getenv("HOT_SKU_LEASE", 100))
+# Seconds without reservations after which a product's held units go back to its row
+HOT_SKU_IDLE_FLUSH = float(os.getenv("HOT_SKU_IDLE_FLUSH", 5))
+
+logger = logging.getLogger(__name__)
+
+
+class _Stripe:
+    __slots__ = ("lock", "count")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.count = 0
+
+
+class StripedStockCounter:
+    """
+    In-memory stock front-end for a few very hot products.
+
+    Stock moves from the product row into memory in blocks of ``lease_size``
+    through ``lease(product_id, amount)``, a conditional UPDATE that either
+    takes the whole amount or nothing, so memory never holds units the
+    database did not give up and nothing can be oversold. Reservations are
+    then served from ``stripes`` independently locked counters, so
+    concurrent buyers of the same product rarely wait on each other or on
+    the database. ``give_back(product_id, amount)`` returns unsold units to
+    the row: after ``idle_flush`` seconds without reservations (once
+    ``start()`` runs the flusher thread) and on ``stop()``.
+
+    While units are leased, the product row shows less stock than is
+    actually available; a killed process loses at most the units of the
+    products that were busy.
+    """
+
+    def __init__(
+            self,
+            product_ids: Iterable[int],
+            lease: Callable[[int, int], bool],
+            give_back: Callable[[int, int], None],
+            stripes: int = HOT_SKU_STRIPES,
+            lease_size: int = HOT_SKU_LEASE,
+            idle_flush: float = HOT_SKU_IDLE_FLUSH
+    ):
+        self.lease_size = lease_size
+        self.idle_flush = idle_flush
+        self._lease = lease
+        self._give_back = give_back
+        self._stripes: Dict[int, List[_Stripe]] = {
+            product_id: [_Stripe() for _ in range(stripes)] for product_id in product_ids
+        }
+        self._refill_locks = {product_id: threading.Lock() for product_id in self._stripes}
+        self._last_used = {product_id: 0.0 for product_id in self._stripes}
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self.leases = 0
+
+    def __contains__(self, product_id: int) -> bool:
+        return product_id in self._stripes
+
+    def _home(self, product_id: int) -> _Stripe:
+        stripes = self._stripes[product_id]
+        return stripes[threading.get_ident() % len(stripes)]
+
+    def try_reserve(self, product_id: int, quantity: int) -> bool:
+        """Take ``quantity`` units from memory only; never touches the database."""
+        self._last_used[product_id] = time.monotonic()
+        for stripe in self._stripes[product_id]:
+            with stripe.lock:
+                if stripe.count >= quantity:
+                    stripe.count -= quantity
+                    return True
+        return False
+
+    def reserve(self, product_id: int, quantity: int) -> bool:
+        """
+        Take ``quantity`` units of a hot product.
+
+        Args:
+            product_id: A product passed to the constructor.
+            quantity: Units to reserve.
+
+        Returns:
+            True if reserved, False if not enough stock is left anywhere.
+        """
+        if self.try_reserve(product_id, quantity):
+            return True
+
+        with self._refill_locks[product_id]:
+            # Pool what the stripes still hold, then lease the shortfall.
+            pooled = 0
+            for stripe in self._stripes[product_id]:
+                with stripe.lock:
+                    pooled += stripe.count
+                    stripe.count = 0
+            home = self._home(product_id)
+            if pooled >= quantity:
+                with home.lock:
+                    home.count += pooled - quantity
+                return True
+            shortfall = quantity - pooled
+            for amount in (max(self.lease_size, shortfall), shortfall):
+                if self._lease(product_id, amount):
+                    self.leases += 1
+                    with home.lock:
+                        home.count += amount - shortfall
+                    return True
+            with home.lock:
+                home.count += pooled
+            return False
+
+    def release(self, product_id: int, quantity: int) -> None:
+        """Put reserved units of a hot product back in memory."""
+        self._last_used[product_id] = time.monotonic()
+        home = self._home(product_id)
+        with home.lock:
+            home.count += quantity
+
+    def flush(self, product_ids: Optional[Iterable[int]] = None) -> None:
+        """Return the units held in memory to the product rows (all products by default)."""
+        for product_id in self._stripes if product_ids is None else product_ids:
+            stripes = self._stripes[product_id]
+            with self._refill_locks[product_id]:
+                held = 0
+                for stripe in stripes:
+                    with stripe.lock:
+                        held += stripe.count
+                        stripe.count = 0
+                if not held:
+                    continue
+                try:
+                    self._give_back(product_id, held)
+                except BaseException:
+                    # Keep the units in memory rather than lose them
+                    self.release(product_id, held)
+                    raise
+
+    def flush_idle(self) -> None:
+        """Flush the products nobody reserved in the last ``idle_flush`` seconds."""
+        cutoff = time.monotonic() - self.idle_flush
+        self.flush([product_id for product_id, used in self._last_used.items() if used < cutoff])
+
+    def start(self) -> None:
+        """Start the thread that flushes idle products in the background."""
+        if not self._stripes or self._flusher is not None:
+            return
+        self._stop.clear()
+        self._flusher = threading.Thread(target=self._run_flusher, name="hot-stock-flusher", daemon=True)
+        self._flusher.start()
+
+    def stop(self) -> None:
+        """Stop the flusher thread and return every held unit, e.g. on shutdown."""
+        if self._flusher is not None:
+            self._stop.set()
+            self._flusher.join()
+            self._flusher = None
+        self.flush()
+
+    def _run_flusher(self) -> None:
+        while not self._stop.wait(self.idle_flush):
+            try:
+                self.flush_idle()
+            except Exception:
+                # e.g. "database is locked": the units stay held; retry next round
+                logger.exception("could not return idle hot-SKU stock")
+
+    def stats(self) -> Dict[str, int]:
+        """Return the units held in memory across all hot products and the lease count."""
+        return {
+            "held": sum(stripe.count for stripes in self._stripes.values() for stripe in stripes),
+            "leases": self.leases,
+        }
@@ -0,0 +1,112 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Set, Tuple
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of verified bearer tokens.
+
+    Entries are keyed by the SHA-256 digest of the raw token, so tokens are
+    never kept in memory in clear text, and expire at the token's ``exp``
+    claim. Entries can be dropped per user when the account changes.
+    """
+
+    def __init__(self, maxsize: int = 4096):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[Any, float, str]]" = OrderedDict()
+        self._by_user: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def _discard(self, digest: str) -> None:
+        """Remove an entry and its user index reference. Caller holds the lock."""
+        entry = self._entries.pop(digest, None)
+        if entry is None:
+            return
+        username = entry[2]
+        digests = self._by_user.get(username)
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self._by_user[username]
+
+    def get(self, token: str) -> Optional[Any]:
+        """
+        Return the cached principal for a token.
+
+        Args:
+            token: Raw bearer token.
+
+        Returns:
+            The principal stored by put(), or None on a miss or expired entry.
+        """
+        digest = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(digest)
+            if entry is None:
+                self.misses += 1
+                return None
+            principal, expires_at, _ = entry
+            if expires_at <= time.time():
+                self._discard(digest)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(digest)
+            self.hits += 1
+            return principal
+
+    def put(self, token: str, principal: Any, username: str, expires_at: float) -> None:
+        """
+        Cache a verified token.
+
+        Args:
+            token: Raw bearer token.
+            principal: Object returned to callers on a hit.
+            username: Owner of the token, used by invalidate_user().
+            expires_at: Unix timestamp after which the entry is stale.
+        """
+        if expires_at <= time.time():
+            return
+        digest = self._digest(token)
+        with self._lock:
+            self._discard(digest)
+            self._entries[digest] = (principal, expires_at, username)
+            self._by_user.setdefault(username, set()).add(digest)
+            while len(self._entries) > self.maxsize:
+                oldest = next(iter(self._entries))
+                self._discard(oldest)
+                self.evictions += 1
+
+    def invalidate_user(self, username: str) -> None:
+        """Drop every cached token belonging to a user."""
+        with self._lock:
+            for digest in list(self._by_user.get(username, ())):
+                self._discard(digest)
+
+    def clear(self) -> None:
+        """Drop every cached token."""
+        with self._lock:
+            self._entries.clear()
+            self._by_user.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and the current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
@@ -1,17 +1,27 @@
 import time
-from typing import Generator
+from typing import AsyncGenerator, Generator
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from sqlmodel import SQLModel
-from .database_setup import engine
+from .database_setup import engine, read_engine, async_engine, DB_MODE
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from sqlalchemy.orm import Session, sessionmaker
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+AsyncSessionLocal = (
+    async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    if async_engine is not None else None
+)
 
 
 def create_db_and_tables():
     """Create all database tables"""
     SQLModel.metadata.create_all(bind=engine)
+    # Imported here: crud imports auth, which imports this module.
+    from .crud.product import product_search_index
+    with engine.begin() as connection:
+        product_search_index.create(connection)
 
 def get_session() -> Generator[Session, None, None]:
     """
@@ -24,6 +34,29 @@ def get_session() -> Generator[Session, None, None]:
     finally:
         session.close()
 
+def get_read_session() -> Generator[Session, None, None]:
+    """
+    Dependency function to get a session on the read-only connection pool.
+    Use it for GET routes so reads don't compete with writers for connections.
+    """
+    session = ReadSessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+
+async def get_async_session() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency function to get an async database session (DB_MODE=async).
+    """
+    async with AsyncSessionLocal() as session:
+        yield session
+
+
+# Session dependency for the CRUD endpoints, chosen by DB_MODE
+get_db_session = get_async_session if DB_MODE == "async" else get_session
+get_db_read_session = get_async_session if DB_MODE == "async" else get_read_session
+
 def configure_cors(app: FastAPI) -> None:
     """Configure CORS middleware for the FastAPI app."""
     app.add_middleware(
@@ -32,6 +65,7 @@ def configure_cors(app: FastAPI) -> None:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=["X-Next-Cursor", "X-DB-Query-Count", "X-DB-Time", "X-DB-N-Plus-One"],
     )
 
 def response_time_setup(app: FastAPI) -> None: